@@ -1,9 +1,15 @@
 import logging
 import asyncio
 from typing import Optional
+from urllib.parse import urlencode
 from .rest_client import RestClient
 from ..utils.config import get_settings
-from ..utils.constants import COINGECKO_TOKEN_BY_CONTRACT_PATH, TOKEN_PRICE_CURRENCY
+from ..utils.constants import (
+    COINGECKO_DEFAULT_PLATFORM,
+    COINGECKO_TOKEN_BY_CONTRACT_PATH,
+    COINGECKO_TOKEN_PRICE_PATH,
+    TOKEN_PRICE_CURRENCY,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +28,16 @@ class CoinGeckoClient(RestClient):
         await super().__aenter__()
         return self
 
-    async def _get_token_price_by_address(self, contract_address: str) -> Optional[float]:
+    def _headers(self) -> dict[str, str]:
         headers = {}
         if self.api_key:
             headers["x-cg-demo-api-key"] = self.api_key
+        return headers
 
-        path = COINGECKO_TOKEN_BY_CONTRACT_PATH.format(address=contract_address.lower())
+    async def _get_token_price_by_address(self, contract_address: str, platform: str) -> Optional[float]:
+        headers = self._headers()
+
+        path = COINGECKO_TOKEN_BY_CONTRACT_PATH.format(platform=platform, address=contract_address.lower())
         data = await self.get(path, headers=headers)
 
         if not data:
@@ -36,9 +46,13 @@ class CoinGeckoClient(RestClient):
         price = data.get("market_data", {}).get("current_price", {}).get(TOKEN_PRICE_CURRENCY)
         return price
 
-    async def get_multiple_prices(self, contract_addresses: list[str]) -> dict[str, Optional[float]]:
+    async def get_multiple_prices(
+        self,
+        contract_addresses: list[str],
+        platform: str = COINGECKO_DEFAULT_PLATFORM
+    ) -> dict[str, Optional[float]]:
         tasks = [
-            self._get_token_price_by_address(address)
+            self._get_token_price_by_address(address, platform)
             for address in contract_addresses
         ]
 
@@ -53,3 +67,25 @@ class CoinGeckoClient(RestClient):
                 prices[address.lower()] = result
 
         return prices
+
+    async def get_batch_prices(
+        self,
+        contract_addresses: list[str],
+        platform: str = COINGECKO_DEFAULT_PLATFORM
+    ) -> dict[str, Optional[float]]:
+        """Fetch prices for several contracts in one call. Returns {} if the request failed."""
+        if not contract_addresses:
+            return {}
+
+        addresses = [address.lower() for address in contract_addresses]
+        query = urlencode({"contract_addresses": ",".join(addresses), "vs_currencies": TOKEN_PRICE_CURRENCY})
+        path = COINGECKO_TOKEN_PRICE_PATH.format(platform=platform)
+        data = await self.get(f"{path}?{query}", headers=self._headers())
+
+        if data is None:
+            return {}
+
+        return {
+            address: data.get(address, {}).get(TOKEN_PRICE_CURRENCY)
+            for address in addresses
+        }
@@ -1,32 +1,39 @@
 import logging
-from typing import Any, cast
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from typing import Any, Callable, Optional, TypeVar, cast
+from web3 import AsyncWeb3, AsyncHTTPProvider, Web3
 from web3.types import FilterParams, LogReceipt, BlockIdentifier
 from eth_typing import ChecksumAddress
+from ..utils.chains import DEFAULT_CHAIN, ChainConfig, get_chain
 from ..utils.config import get_settings
 from ..utils.eth_utils import pad_address
-from ..utils.constants import APPROVAL_EVENT_SIGNATURE, ERC20_ABI
+from ..utils.constants import APPROVAL_EVENT_SIGNATURE, ERC20_ABI, FINALITY_FALLBACK_DEPTH, UNKNOWN_TOKEN_SYMBOL
+from ..utils.throttling import Throttling
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class Web3Client:
 
-    def __init__(self) -> None:
+    def __init__(self, chain: Optional[ChainConfig] = None) -> None:
         self.settings = get_settings()
+        self.chain = chain or get_chain(DEFAULT_CHAIN)
         self.api_key = self.settings.infura_api_key
-        self.endpoint = f"{self.settings.infura_endpoint}{self.api_key}"
+        self.endpoint = f"{self.chain.rpc_endpoint}{self.api_key}" if self.chain.append_api_key \
+            else self.chain.rpc_endpoint
 
         provider = AsyncHTTPProvider(self.endpoint)
         self.w3 = AsyncWeb3(provider)
+        self._rpc_throttler = Throttling(max_tasks=self.settings.max_concurrent_rpc_calls)
 
     async def __aenter__(self) -> "Web3Client":
         try:
             is_connected = await self.w3.is_connected()
             if not is_connected:
-                raise ConnectionError("Failed to connect to Infura endpoint")
+                raise ConnectionError(f"Failed to connect to {self.chain.name} endpoint")
 
-            logger.info("Successfully connected to Ethereum via Infura")
+            logger.info(f"Successfully connected to {self.chain.name}")
             return self
         except Exception:
             logger.exception("Failed to initialize Web3 client")
@@ -46,7 +53,7 @@ class Web3Client:
         self,
         from_block: BlockIdentifier,
         to_block: BlockIdentifier,
-        topics: list[str]
+        topics: list[Any]
     ) -> list[LogReceipt]:
         filter_params: FilterParams = {
             'fromBlock': from_block,
@@ -61,7 +68,27 @@ class Web3Client:
         logger.debug(f"Retrieved {len(logs)} logs")
         return list(logs)
 
-    async def get_all_approval_logs(self, owner_address: str) -> list[LogReceipt]:
+    async def _get_logs_in_ranges(self, from_block: int, to_block: int, topics: list[Any]) -> list[LogReceipt]:
+        # Providers that cap the eth_getLogs block range are queried in concurrent chunks
+        step = self.chain.max_block_range
+        if step is None or to_block - from_block < step:
+            return await self._get_logs(from_block, to_block, topics)
+
+        ranges = [(start, min(start + step - 1, to_block)) for start in range(from_block, to_block + 1, step)]
+        if len(ranges) > self.settings.max_log_chunks:
+            raise ValueError(
+                f"Blocks {from_block}-{to_block} on {self.chain.name} need {len(ranges)} eth_getLogs calls, "
+                f"more than the limit of {self.settings.max_log_chunks}"
+            )
+        logger.debug(f"Splitting blocks {from_block}-{to_block} into {len(ranges)} ranges on {self.chain.name}")
+
+        async def fetch(block_range: tuple[int, int]) -> list[LogReceipt]:
+            return await self._get_logs(block_range[0], block_range[1], topics)
+
+        chunks = await self._rpc_throttler.submit(ranges, fetch)
+        return [log for chunk in chunks for log in chunk]
+
+    async def get_all_approval_logs(self, owner_address: str, to_block: BlockIdentifier = 'latest') -> list[LogReceipt]:
         logger.info(f"Fetching all approval events for {owner_address}")
 
         padded_owner = pad_address(owner_address)
@@ -71,16 +98,120 @@ class Web3Client:
             padded_owner,
         ]
 
+        if isinstance(to_block, int) and to_block < self.chain.start_block:
+            logger.info(f"Block {to_block} is before the first scanned block {self.chain.start_block} "
+                        f"on {self.chain.name}, no approvals to fetch")
+            return []
+
         try:
-            logger.info("Attempting to fetch all approvals in single query (blocks 0 to latest)...")
-            logs = await self._get_logs(0, 'latest', topics)
-            logger.info(f"✓ Successfully fetched {len(logs)} approval events in single query!")
+            if self.chain.max_block_range is None:
+                logger.info(f"Attempting to fetch all approvals in single query "
+                            f"(blocks {self.chain.start_block} to {to_block!s})...")
+                logs = await self._get_logs(self.chain.start_block, to_block, topics)
+            else:
+                end_block = to_block if isinstance(to_block, int) else await self.get_latest_block()
+                logs = await self._get_logs_in_ranges(self.chain.start_block, end_block, topics)
+            logger.info(f"✓ Successfully fetched {len(logs)} approval events on {self.chain.name}")
             return logs
 
         except Exception:
             logger.exception("Unexpected error during full range query")
             raise
 
+    async def get_approval_logs(self, owner_addresses: list[str], from_block: int, to_block: int) -> list[LogReceipt]:
+        # Topic position 1 accepts a list, so every owner is matched by a single eth_getLogs call
+        topics: list[Any] = [
+            APPROVAL_EVENT_SIGNATURE,
+            [pad_address(owner) for owner in owner_addresses],
+        ]
+        return await self._get_logs_in_ranges(from_block, to_block, topics)
+
+    async def _execute_batched(
+        self,
+        items: list[T],
+        build_request: Callable[[T], Any],
+        description: str,
+        isolate_failures: bool = False
+    ) -> list[Optional[Any]]:
+        """
+        Send one request per item as JSON-RPC batches. Every item of a failed batch yields None.
+
+        A single failing request fails its whole batch. With isolate_failures a failed batch is
+        split in halves and retried, so a reverting contract call only costs its own result.
+        """
+        batch_size = self.settings.rpc_batch_size
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+        async def fetch(batch_items: list[T]) -> list[Optional[Any]]:
+            try:
+                async with self.w3.batch_requests() as batch:
+                    for item in batch_items:
+                        batch.add(build_request(item))
+                    return list(await batch.async_execute())
+            except Exception as e:
+                if not isolate_failures:
+                    logger.warning(f"Failed to fetch {description} for {len(batch_items)} items on {self.chain.name}: {e}")
+                    return [None] * len(batch_items)
+                if len(batch_items) == 1:
+                    logger.debug(f"Failed to fetch {description} for {batch_items[0]} on {self.chain.name}: {e}")
+                    return [None]
+
+            middle = len(batch_items) // 2
+            return await fetch(batch_items[:middle]) + await fetch(batch_items[middle:])
+
+        results = await self._rpc_throttler.submit(batches, fetch)
+        return [result for batch_results in results for result in batch_results]
+
+    async def get_codes(self, queries: list[tuple[str, BlockIdentifier]]) -> list[Optional[bytes]]:
+        """eth_getCode for (address, block) pairs. Failed lookups yield None."""
+        results = await self._execute_batched(
+            queries,
+            lambda query: self.w3.eth.get_code(Web3.to_checksum_address(query[0]), query[1]),
+            "code"
+        )
+        return [bytes(code) if code is not None else None for code in results]
+
+    async def get_block_timestamps(self, block_numbers: list[int]) -> list[Optional[int]]:
+        """Timestamps of the given blocks, fetched as batched eth_getBlockByNumber calls without transactions."""
+        blocks = await self._execute_batched(
+            block_numbers,
+            lambda block_number: self.w3.eth.get_block(block_number, full_transactions=False),
+            "block headers"
+        )
+        return [int(block['timestamp']) if block is not None else None for block in blocks]
+
+    async def get_multiple_token_decimals(self, token_addresses: list[str]) -> list[Optional[int]]:
+        """decimals() of several tokens, fetched as batched eth_call. Failed lookups yield None."""
+        results = await self._execute_batched(
+            token_addresses,
+            lambda token_address: self._erc20(token_address).functions.decimals(),
+            "decimals",
+            isolate_failures=True
+        )
+        return [int(decimals) if decimals is not None else None for decimals in results]
+
+    async def get_multiple_token_balances(self, holdings: list[tuple[str, str]]) -> list[Optional[int]]:
+        """balanceOf for (token, owner) pairs, fetched as batched eth_call. Failed lookups yield None."""
+        results = await self._execute_batched(
+            holdings,
+            lambda holding: self._erc20(holding[0]).functions.balanceOf(Web3.to_checksum_address(holding[1])),
+            "balances",
+            isolate_failures=True
+        )
+        return [int(balance) if balance is not None else None for balance in results]
+
+    def _erc20(self, token_address: str) -> Any:
+        return self.w3.eth.contract(address=Web3.to_checksum_address(token_address), abi=ERC20_ABI)
+
+    async def get_finalized_block_number(self) -> int:
+        try:
+            block = await self.w3.eth.get_block('finalized')
+            return int(block['number'])
+        except Exception as e:
+            # Not every chain exposes the finalized tag, fall back to a conservative depth
+            logger.debug(f"Failed to fetch finalized block on {self.chain.name}: {e}")
+            return await self.get_latest_block() - FINALITY_FALLBACK_DEPTH
+
     async def get_token_symbol(self, token_address: str) -> str:
         try:
             contract = self.w3.eth.contract(
@@ -88,10 +219,10 @@ class Web3Client:
                 abi=ERC20_ABI
             )
             symbol = await contract.functions.symbol().call()
-            return symbol.strip() if symbol else "UnknownERC20"
+            return symbol.strip() if symbol else UNKNOWN_TOKEN_SYMBOL
         except Exception as e:
             logger.debug(f"Failed to fetch symbol for token {token_address}: {e}")
-            return "UnknownERC20"
+            return UNKNOWN_TOKEN_SYMBOL
 
     async def get_token_name(self, token_address: str) -> str:
         try:
@@ -100,7 +231,7 @@ class Web3Client:
                 abi=ERC20_ABI
             )
             name = await contract.functions.name().call()
-            return name.strip() if name else "UnknownERC20"
+            return name.strip() if name else UNKNOWN_TOKEN_SYMBOL
         except Exception as e:
             logger.debug(f"Failed to fetch name for token {token_address}: {e}")
-            return "UnknownERC20"
+            return UNKNOWN_TOKEN_SYMBOL
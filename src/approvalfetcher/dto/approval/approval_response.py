@@ -1,35 +1,87 @@
-from hexbytes import HexBytes
+from datetime import datetime
+
 from pydantic import BaseModel, Field
-from approvalfetcher.model.approval import ApprovalEvents
-from approvalfetcher.utils.formatters import parse_amount
+from approvalfetcher.model.approval import ApprovalEvents, SpenderType
+from approvalfetcher.utils.exposure import compute_exposures, format_decimal
+from approvalfetcher.utils.formatters import format_amount
 
 
 class ApprovalEventResponse(BaseModel):
     address: str = Field(..., description="Address")
+    chain: str = Field("ethereum", description="Chain the approval was found on")
     token_symbol: str | None = Field(None, description="Token symbol")
+    block_number: int | None = Field(None, description="Block the approval was emitted in")
+    log_index: int | None = Field(None, description="Position of the approval log in its block")
+    transaction_hash: str | None = Field(None, description="Hash of the approval transaction")
+    block_timestamp: datetime | None = Field(None, description="Timestamp of the approval block")
     spender: str = Field(..., description="Spender address")
+    spender_type: SpenderType | None = Field(None, description="Whether the spender is an EOA, a contract or a destroyed contract")
+    spender_code_hash: str | None = Field(None, description="Keccak hash of the spender code")
     value: str = Field(..., description="Approved amount")
     token_price: float | None = Field(None, description="Token price in USD")
+    token_decimals: int | None = Field(None, description="Token decimals")
+    amount: str | None = Field(None, description="Approved amount in token units (None if unlimited or decimals unknown)")
+    is_unlimited: bool = Field(False, description="Whether the approval is effectively unlimited")
+    exposure_usd: float | None = Field(None, description="USD value the spender can move, capped at the owner's balance when requested")
 
 
 class ApprovalsResponse(BaseModel):
     events: list[ApprovalEventResponse] = Field(..., description="List of approval events")
+    total: int | None = Field(None, description="Number of approval events matching the filters across all pages")
+    next_cursor: str | None = Field(None, description="Cursor of the next page, None on the last page")
 
 
-def to_response(approval_events_list: list[ApprovalEvents], prices: dict[str, float | None] | None = None) -> ApprovalsResponse:
+def to_response(
+        approval_events_list: list[ApprovalEvents],
+        prices: dict[tuple[str, str], float | None] | None = None,
+        decimals: dict[tuple[str, str], int | None] | None = None,
+        balances: dict[tuple[str, str, str], int | None] | None = None,
+        total: int | None = None,
+        next_cursor: str | None = None
+) -> ApprovalsResponse:
     prices = prices or {}
+    decimals = decimals or {}
+
+    # Token data is keyed by chain, the same contract address can be a different token elsewhere
+    all_events = [(ae.address, ae.chain, event) for ae in approval_events_list for event in ae.events]
+    token_keys = [(chain, event.token_address.lower()) for _, chain, event in all_events]
+
+    # ApprovalEvent.value holds the raw amount as a decimal string
+    values = [int(event.value, 0) for _, _, event in all_events]
+    exposures = compute_exposures(
+        values=values,
+        decimals=[decimals.get(token_key) for token_key in token_keys],
+        prices=[prices.get(token_key) for token_key in token_keys],
+        balances=[
+            balances.get((chain, address.lower(), token))
+            for (address, _, _), (chain, token) in zip(all_events, token_keys)
+        ] if balances is not None else None,
+    )
 
-    all_events = [(ae.address, event) for ae in approval_events_list for event in ae.events]
+    rows = zip(all_events, token_keys, values, exposures)
 
     return ApprovalsResponse(
         events=[
             ApprovalEventResponse(
                 address=address,
+                chain=chain,
                 token_symbol=event.token_symbol,
+                block_number=event.block_number,
+                log_index=event.log_index,
+                transaction_hash=event.transaction_hash,
+                block_timestamp=event.block_timestamp,
                 spender=event.spender,
-                value=parse_amount(HexBytes(event.value)),
-                token_price=prices.get(event.token_address.lower())
+                spender_type=event.spender_type,
+                spender_code_hash=event.spender_code_hash,
+                value=format_amount(value),
+                token_price=prices.get(token_key),
+                token_decimals=decimals.get(token_key),
+                amount=format_decimal(exposure.amount) if exposure.amount is not None else None,
+                is_unlimited=exposure.is_unlimited,
+                exposure_usd=exposure.exposure_usd
             )
-            for address, event in all_events
-        ]
+            for (address, chain, event), token_key, value, exposure in rows
+        ],
+        total=total,
+        next_cursor=next_cursor
     )
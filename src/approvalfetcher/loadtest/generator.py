@@ -0,0 +1,107 @@
+import asyncio
+import http
+import logging
+import random
+import time
+from typing import NamedTuple, Optional
+
+import aiohttp
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+
+class TrafficMix(BaseModel):
+    address_set_sizes: dict[int, float] = Field(
+        default={1: 0.7, 5: 0.2, 25: 0.08, 100: 0.02},
+        description="Address set size -> share of requests",
+    )
+    repeat_rate: float = Field(default=0.8, description="Share of requests that reuse an earlier address set")
+    hot_sets: int = Field(default=200, description="How many earlier address sets can be repeated")
+
+
+class RequestResult(NamedTuple):
+    started_at: float
+    latency_seconds: float
+    status: int
+    address_count: int
+
+
+class TrafficGenerator:
+    """Picks address sets for requests following a TrafficMix."""
+
+    def __init__(self, mix: TrafficMix, seed: int = 0):
+        self.mix = mix
+        self._random = random.Random(seed)
+        self._sizes = list(mix.address_set_sizes)
+        self._weights = list(mix.address_set_sizes.values())
+        self._seen: list[list[str]] = []
+
+    def next_addresses(self) -> list[str]:
+        if self._seen and self._random.random() < self.mix.repeat_rate:
+            return self._random.choice(self._seen)
+
+        size = self._random.choices(self._sizes, weights=self._weights)[0]
+        addresses = ["0x" + format(self._random.getrandbits(160), "040x") for _ in range(size)]
+
+        if len(self._seen) >= self.mix.hot_sets:
+            self._seen[self._random.randrange(len(self._seen))] = addresses
+        else:
+            self._seen.append(addresses)
+        return addresses
+
+
+async def run_open_loop(
+        url: str,
+        rps: float,
+        duration_seconds: float,
+        generator: TrafficGenerator,
+        timeout_seconds: float = 60.0,
+        seed: int = 0
+) -> list[RequestResult]:
+    """
+    Send requests on a Poisson schedule regardless of how fast earlier ones complete.
+
+    Unlike a closed loop, a slow server does not slow the arrivals down, so queueing shows
+    up in the measured latency instead of hiding in a lower request rate.
+    """
+    arrivals = random.Random(seed)
+    results: list[RequestResult] = []
+    in_flight: set[asyncio.Task[None]] = set()
+    etags: dict[tuple[str, ...], str] = {}
+
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout_seconds)) as session:
+
+        async def send(addresses: list[str]) -> None:
+            key = tuple(addresses)
+            headers = {"If-None-Match": etags[key]} if key in etags else {}
+            started_at = time.monotonic()
+            status = 0
+            try:
+                async with session.post(url, json=addresses, headers=headers) as response:
+                    await response.read()
+                    status = response.status
+                    etag: Optional[str] = response.headers.get("ETag")
+                    if etag:
+                        etags[key] = etag
+            except Exception as e:
+                logger.debug(f"Request failed: {e}")
+            results.append(RequestResult(started_at, time.monotonic() - started_at, status, len(addresses)))
+
+        start = time.monotonic()
+        next_arrival = start
+        while next_arrival - start < duration_seconds:
+            await asyncio.sleep(max(next_arrival - time.monotonic(), 0.0))
+            task = asyncio.create_task(send(generator.next_addresses()))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            next_arrival += arrivals.expovariate(rps)
+
+        if in_flight:
+            await asyncio.wait(in_flight)
+
+    return results
+
+
+def is_success(status: int) -> bool:
+    return status in (http.HTTPStatus.OK, http.HTTPStatus.NOT_MODIFIED)
@@ -0,0 +1,85 @@
+import math
+from collections import Counter
+from typing import Sequence
+
+from pydantic import BaseModel, Field
+
+from .generator import RequestResult, is_success
+
+
+class WorkerMemory(BaseModel):
+    pid: int
+    rss_mb: float
+    peak_rss_mb: float
+
+
+class LoadReport(BaseModel):
+    duration_seconds: float = Field(..., description="Length of the traffic window")
+    sent: int = Field(..., description="Requests sent")
+    succeeded: int = Field(..., description="Requests answered with 200 or 304")
+    not_modified: int = Field(..., description="Requests answered with 304")
+    statuses: dict[str, int] = Field(..., description="Response count per status, 0 for transport errors")
+    sustained_rps: float = Field(..., description="Successful requests per second")
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    rpc_calls_per_request: float = Field(..., description="JSON-RPC requests (batch items counted) per successful request")
+    coingecko_calls_per_request: float = Field(..., description="CoinGecko HTTP calls per successful request")
+    upstream_rejections: int = Field(..., description="Upstream calls answered with injected 429 or 500")
+    workers: list[WorkerMemory] = Field(default_factory=list)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def build_report(
+        results: list[RequestResult],
+        duration_seconds: float,
+        rpc_calls: int,
+        coingecko_calls: int,
+        upstream_rejections: int,
+        worker_memory: dict[int, tuple[float, float]]
+) -> LoadReport:
+    succeeded = [result for result in results if is_success(result.status)]
+    latencies_ms = [result.latency_seconds * 1000 for result in succeeded]
+    successes = max(len(succeeded), 1)
+
+    return LoadReport(
+        duration_seconds=duration_seconds,
+        sent=len(results),
+        succeeded=len(succeeded),
+        not_modified=sum(1 for result in results if result.status == 304),
+        statuses={str(status): count for status, count in sorted(Counter(r.status for r in results).items())},
+        sustained_rps=len(succeeded) / duration_seconds if duration_seconds else 0.0,
+        latency_p50_ms=percentile(latencies_ms, 50),
+        latency_p95_ms=percentile(latencies_ms, 95),
+        latency_p99_ms=percentile(latencies_ms, 99),
+        rpc_calls_per_request=rpc_calls / successes,
+        coingecko_calls_per_request=coingecko_calls / successes,
+        upstream_rejections=upstream_rejections,
+        workers=[
+            WorkerMemory(pid=pid, rss_mb=round(rss, 1), peak_rss_mb=round(peak, 1))
+            for pid, (rss, peak) in sorted(worker_memory.items())
+        ],
+    )
+
+
+def format_report(report: LoadReport) -> str:
+    lines = [
+        f"requests          sent {report.sent}, ok {report.succeeded} ({report.not_modified} not modified)",
+        f"statuses          {', '.join(f'{status}: {count}' for status, count in report.statuses.items())}",
+        f"sustained rps     {report.sustained_rps:.1f}",
+        f"latency ms        p50 {report.latency_p50_ms:.1f}  p95 {report.latency_p95_ms:.1f}  "
+        f"p99 {report.latency_p99_ms:.1f}",
+        f"upstream/request  rpc {report.rpc_calls_per_request:.2f}  coingecko {report.coingecko_calls_per_request:.2f}"
+        f"  (rejected {report.upstream_rejections})",
+    ]
+    for worker in report.workers:
+        lines.append(f"worker {worker.pid:<10} rss {worker.rss_mb:.1f} MB, peak {worker.peak_rss_mb:.1f} MB")
+    return "\n".join(lines)
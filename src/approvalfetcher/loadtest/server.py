@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+PROC = Path("/proc")
+
+
+class ServerProcess:
+    """Runs main_server.app under uvicorn in a subprocess and measures its workers."""
+
+    def __init__(self, port: int, workers: int, env: dict[str, str], startup_timeout_seconds: float = 30.0):
+        self.port = port
+        self.workers = workers
+        self.env = env
+        self.startup_timeout_seconds = startup_timeout_seconds
+        self.url = f"http://127.0.0.1:{port}"
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    async def __aenter__(self) -> "ServerProcess":
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "uvicorn", "approvalfetcher.main_server:app",
+            "--host", "127.0.0.1",
+            "--port", str(self.port),
+            "--workers", str(self.workers),
+            "--log-level", "warning",
+            env={**os.environ, **self.env},
+        )
+        await self._wait_until_healthy()
+        logger.info(f"Server with {self.workers} workers listening on {self.url}")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._process and self._process.returncode is None:
+            self._process.terminate()
+            try:
+                await asyncio.wait_for(self._process.wait(), timeout=10)
+            except asyncio.TimeoutError:
+                self._process.kill()
+                await self._process.wait()
+
+    async def _wait_until_healthy(self) -> None:
+        deadline = time.monotonic() + self.startup_timeout_seconds
+        async with aiohttp.ClientSession() as session:
+            while time.monotonic() < deadline:
+                if self._process and self._process.returncode is not None:
+                    raise RuntimeError(f"Server exited with code {self._process.returncode}")
+                try:
+                    async with session.get(f"{self.url}/health") as response:
+                        if response.status == 200:
+                            return
+                except aiohttp.ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        raise RuntimeError(f"Server did not become healthy within {self.startup_timeout_seconds}s")
+
+    def worker_memory_mb(self) -> dict[int, tuple[float, float]]:
+        """Current and peak resident memory per worker pid. Only available on Linux."""
+        if self._process is None or not PROC.exists():
+            return {}
+
+        # With a single worker uvicorn serves from the main process itself
+        pids = _worker_pids(self._process.pid) or [self._process.pid]
+        memory = {}
+        for pid in pids:
+            status = _read_status(pid)
+            if "VmRSS" in status:
+                memory[pid] = (status["VmRSS"] / 1024, status.get("VmHWM", status["VmRSS"]) / 1024)
+        return memory
+
+
+def _worker_pids(parent_pid: int) -> list[int]:
+    # Spawned workers, leaving out helpers such as the multiprocessing resource tracker
+    return [pid for pid in _child_pids(parent_pid) if b"spawn_main" in _read_cmdline(pid)]
+
+
+def _child_pids(parent_pid: int) -> list[int]:
+    children = []
+    for stat_path in PROC.glob("[0-9]*/stat"):
+        try:
+            # The command name may contain spaces, the fields after it are fixed
+            fields = stat_path.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == parent_pid:
+            children.append(int(stat_path.parent.name))
+    return children
+
+
+def _read_cmdline(pid: int) -> bytes:
+    try:
+        return (PROC / str(pid) / "cmdline").read_bytes()
+    except OSError:
+        return b""
+
+
+def _read_status(pid: int) -> dict[str, int]:
+    try:
+        lines = (PROC / str(pid) / "status").read_text().splitlines()
+    except OSError:
+        return {}
+
+    status = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if value.strip().endswith("kB"):
+            status[name] = int(value.split()[0])
+    return status
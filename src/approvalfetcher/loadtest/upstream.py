@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import http
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from aiohttp import web
+from eth_abi.abi import encode
+from pydantic import BaseModel, Field
+
+from ..utils.constants import APPROVAL_EVENT_SIGNATURE, TOKEN_PRICE_CURRENCY
+
+logger = logging.getLogger(__name__)
+
+UNLIMITED_APPROVAL = 2 ** 256 - 1
+FINALITY_DEPTH = 64
+BLOCK_TIME_SECONDS = 12
+GENESIS_TIMESTAMP = 1_438_269_973
+
+SELECTOR_NAME = "0x06fdde03"
+SELECTOR_SYMBOL = "0x95d89b41"
+SELECTOR_DECIMALS = "0x313ce567"
+SELECTOR_BALANCE_OF = "0x70a08231"
+
+
+class UpstreamProfile(BaseModel):
+    latency_ms: float = Field(default=50.0, description="Mean response latency")
+    jitter_ms: float = Field(default=10.0, description="Uniform jitter added to the latency")
+    rate_limit: Optional[float] = Field(default=None, description="Requests per second before answering 429")
+    error_rate: float = Field(default=0.0, description="Share of requests answered with 500")
+
+
+def _address(label: str) -> str:
+    return "0x" + hashlib.sha256(label.encode()).hexdigest()[:40]
+
+
+def _seed(address: str) -> int:
+    return int(address[-40:], 16)
+
+
+class FakeUpstream(ABC):
+    """Local HTTP stand-in for an upstream API with configurable latency, rate limit and errors."""
+
+    def __init__(self, profile: UpstreamProfile, seed: int = 0):
+        self.profile = profile
+        self.calls = 0
+        self.rejected = 0
+        self.url = ""
+        self._random = random.Random(seed)
+        self._bucket = profile.rate_limit or 0.0
+        self._last_refill = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "FakeUpstream":
+        app = web.Application()
+        self._add_routes(app)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        logger.info(f"{type(self).__name__} listening on {self.url}")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    def reset_counters(self) -> None:
+        self.calls = 0
+        self.rejected = 0
+
+    @abstractmethod
+    def _add_routes(self, app: web.Application) -> None:
+        ...
+
+    async def _admit(self, weight: int = 1) -> Optional[web.Response]:
+        """Apply latency, rate limit and error injection. Returns the error response to send, if any."""
+        self.calls += weight
+        delay = self.profile.latency_ms + self._random.uniform(-self.profile.jitter_ms, self.profile.jitter_ms)
+        await asyncio.sleep(max(delay, 0.0) / 1000)
+
+        if self.profile.rate_limit is not None:
+            now = time.monotonic()
+            self._bucket = min(self.profile.rate_limit, self._bucket + (now - self._last_refill) * self.profile.rate_limit)
+            self._last_refill = now
+            if self._bucket < weight:
+                self.rejected += weight
+                return web.Response(status=http.HTTPStatus.TOO_MANY_REQUESTS)
+            self._bucket -= weight
+
+        if self._random.random() < self.profile.error_rate:
+            self.rejected += weight
+            return web.Response(status=http.HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        return None
+
+
+class FakeRpcServer(FakeUpstream):
+    """
+    JSON-RPC node serving deterministic synthetic approvals.
+
+    Every owner gets a fixed set of Approval logs derived from its address, drawn from shared
+    token and spender pools so that popular tokens and spenders repeat across owners.
+    """
+
+    def __init__(
+        self,
+        profile: UpstreamProfile,
+        chain_id: int = 1,
+        head_block: int = 20_000_000,
+        block_time_seconds: Optional[float] = None,
+        max_approvals_per_owner: int = 40,
+        token_pool_size: int = 300,
+        spender_pool_size: int = 60,
+        seed: int = 0,
+    ):
+        super().__init__(profile, seed)
+        self.chain_id = chain_id
+        self.head_block = head_block
+        self.block_time_seconds = block_time_seconds
+        self.max_approvals_per_owner = max_approvals_per_owner
+        self.tokens = [_address(f"token-{i}") for i in range(token_pool_size)]
+        self.spenders = [_address(f"spender-{i}") for i in range(spender_pool_size)]
+        self._started_at = time.monotonic()
+
+    def _add_routes(self, app: web.Application) -> None:
+        app.router.add_post("/", self._handle)
+
+    def _head(self) -> int:
+        if not self.block_time_seconds:
+            return self.head_block
+        return self.head_block + int((time.monotonic() - self._started_at) / self.block_time_seconds)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        requests = body if isinstance(body, list) else [body]
+
+        rejected = await self._admit(len(requests))
+        if rejected is not None:
+            return rejected
+
+        responses = [self._dispatch(rpc_request) for rpc_request in requests]
+        return web.json_response(responses if isinstance(body, list) else responses[0])
+
+    def _dispatch(self, rpc_request: dict[str, Any]) -> dict[str, Any]:
+        method = rpc_request["method"]
+        params = rpc_request.get("params", [])
+        handler = getattr(self, f"_rpc_{method}", None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": rpc_request["id"], "error": {"code": -32601, "message": f"{method} not found"}}
+        return {"jsonrpc": "2.0", "id": rpc_request["id"], "result": handler(*params)}
+
+    def _block(self, identifier: Any) -> int:
+        if identifier in ("latest", "pending", "safe"):
+            return self._head()
+        if identifier == "finalized":
+            return self._head() - FINALITY_DEPTH
+        if identifier == "earliest":
+            return 0
+        return int(identifier, 16) if isinstance(identifier, str) else int(identifier)
+
+    def _rpc_web3_clientVersion(self) -> str:
+        return "approvalfetcher-loadtest/fake-rpc"
+
+    def _rpc_eth_chainId(self) -> str:
+        return hex(self.chain_id)
+
+    def _rpc_eth_blockNumber(self) -> str:
+        return hex(self._head())
+
+    def _rpc_eth_getBlockByNumber(self, identifier: Any, full_transactions: bool = False) -> dict[str, Any]:
+        number = self._block(identifier)
+        return {
+            "number": hex(number),
+            "hash": "0x" + hashlib.sha256(f"block-{number}".encode()).hexdigest(),
+            "parentHash": "0x" + hashlib.sha256(f"block-{number - 1}".encode()).hexdigest(),
+            "timestamp": hex(GENESIS_TIMESTAMP + number * BLOCK_TIME_SECONDS),
+            "transactions": [],
+        }
+
+    def _rpc_eth_getCode(self, address: str, identifier: Any = "latest") -> str:
+        # Two thirds of the addresses are contracts, about one in twenty of those was destroyed since
+        seed = _seed(address)
+        if seed % 3 == 0:
+            return "0x"
+        if seed % 30 == 1 and self._block(identifier) == self._head():
+            return "0x"
+        return "0x6080604052" + format(seed % 2 ** 32, "08x")
+
+    def _rpc_eth_call(self, transaction: dict[str, Any], identifier: Any = "latest") -> str:
+        data = transaction.get("data") or transaction.get("input") or "0x"
+        selector = data[:10]
+        seed = _seed(transaction["to"])
+
+        if selector in (SELECTOR_SYMBOL, SELECTOR_NAME):
+            return "0x" + encode(["string"], [f"TKN{seed % 10_000}"]).hex()
+        if selector == SELECTOR_DECIMALS:
+            return "0x" + encode(["uint8"], [(6, 8, 18, 18)[seed % 4]]).hex()
+        if selector == SELECTOR_BALANCE_OF:
+            owner_seed = int(data[-40:], 16)
+            return "0x" + encode(["uint256"], [(seed ^ owner_seed) % 10 ** 24]).hex()
+        return "0x"
+
+    def _rpc_eth_getLogs(self, filter_params: dict[str, Any]) -> list[dict[str, Any]]:
+        from_block = self._block(filter_params.get("fromBlock", "earliest"))
+        to_block = self._block(filter_params.get("toBlock", "latest"))
+        topics = filter_params.get("topics") or []
+        if not topics or topics[0] != APPROVAL_EVENT_SIGNATURE or len(topics) < 2:
+            return []
+
+        owners = topics[1] if isinstance(topics[1], list) else [topics[1]]
+        return [
+            log
+            for owner in owners
+            for log in self._approval_logs(owner)
+            if from_block <= int(log["blockNumber"], 16) <= to_block
+        ]
+
+    def _approval_logs(self, padded_owner: str) -> list[dict[str, Any]]:
+        rng = random.Random(_seed(padded_owner))
+        logs = []
+        for log_index in range(rng.randint(0, self.max_approvals_per_owner)):
+            # Squaring skews the choice towards the start of the pools, like real token popularity
+            token = self.tokens[int(rng.random() ** 2 * len(self.tokens))]
+            spender = self.spenders[int(rng.random() ** 2 * len(self.spenders))]
+            value = UNLIMITED_APPROVAL if rng.random() < 0.4 else rng.randint(1, 10 ** 24)
+            block = rng.randint(1, self.head_block)
+            tx_hash = "0x" + hashlib.sha256(f"{padded_owner}-{log_index}".encode()).hexdigest()
+
+            logs.append({
+                "address": token,
+                "topics": [APPROVAL_EVENT_SIGNATURE, padded_owner, "0x" + spender[2:].zfill(64)],
+                "data": "0x" + format(value, "064x"),
+                "blockNumber": hex(block),
+                "blockHash": "0x" + hashlib.sha256(f"block-{block}".encode()).hexdigest(),
+                "transactionHash": tx_hash,
+                "transactionIndex": "0x0",
+                "logIndex": hex(log_index),
+                "removed": False,
+            })
+        return logs
+
+
+class FakeCoinGeckoServer(FakeUpstream):
+    """CoinGecko stand-in with deterministic prices, roughly one token in ten is unlisted."""
+
+    def _add_routes(self, app: web.Application) -> None:
+        app.router.add_get("/coins/{platform}/contract/{address}", self._handle_contract)
+        app.router.add_get("/simple/token_price/{platform}", self._handle_token_price)
+
+    @staticmethod
+    def _price(address: str) -> Optional[float]:
+        seed = _seed(address.lower())
+        if seed % 10 == 0:
+            return None
+        return round((seed % 1_000_000) / 100, 2)
+
+    async def _handle_contract(self, request: web.Request) -> web.Response:
+        rejected = await self._admit()
+        if rejected is not None:
+            return rejected
+
+        price = self._price(request.match_info["address"])
+        if price is None:
+            return web.Response(status=http.HTTPStatus.NOT_FOUND)
+        return web.json_response({"market_data": {"current_price": {TOKEN_PRICE_CURRENCY: price}}})
+
+    async def _handle_token_price(self, request: web.Request) -> web.Response:
+        rejected = await self._admit()
+        if rejected is not None:
+            return rejected
+
+        addresses = request.query.get("contract_addresses", "").split(",")
+        prices = {address: self._price(address) for address in addresses if address}
+        return web.json_response({
+            address: {TOKEN_PRICE_CURRENCY: price} for address, price in prices.items() if price is not None
+        })
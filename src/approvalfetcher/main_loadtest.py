@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from approvalfetcher.loadtest.generator import TrafficGenerator, TrafficMix, run_open_loop
+from approvalfetcher.loadtest.report import LoadReport, build_report, format_report
+from approvalfetcher.loadtest.server import ServerProcess
+from approvalfetcher.loadtest.upstream import FakeCoinGeckoServer, FakeRpcServer, UpstreamProfile
+from approvalfetcher.utils.cli import parse_loadtest_args
+from approvalfetcher.utils.logging_config import setup_logging
+
+
+def _profile(args: argparse.Namespace, name: str) -> UpstreamProfile:
+    return UpstreamProfile(
+        latency_ms=getattr(args, f"{name}_latency_ms"),
+        jitter_ms=getattr(args, f"{name}_jitter_ms"),
+        rate_limit=getattr(args, f"{name}_rate_limit"),
+        error_rate=getattr(args, f"{name}_error_rate"),
+    )
+
+
+async def run_loadtest(args: argparse.Namespace) -> LoadReport:
+    rpc_server = FakeRpcServer(_profile(args, "rpc"), block_time_seconds=args.block_time, seed=args.seed)
+    coingecko_server = FakeCoinGeckoServer(_profile(args, "coingecko"), seed=args.seed)
+
+    # A fresh sqlite cache per run, so every run starts cold
+    with tempfile.TemporaryDirectory() as cache_dir:
+        async with rpc_server, coingecko_server:
+            env = {
+                "INFURA_API_KEY": "loadtest",
+                "ENABLED_CHAINS": json.dumps(["ethereum"]),
+                "CHAIN_RPC_ENDPOINTS": json.dumps({"ethereum": f"{rpc_server.url}/"}),
+                "COINGECKO_BASE_URL": coingecko_server.url,
+                "COINGECKO_API_KEY": "",
+                "CACHE_BACKEND": args.cache_backend,
+                "CACHE_SQLITE_PATH": str(Path(cache_dir) / "cache.sqlite3"),
+                "LOG_LEVEL": "WARNING",
+            }
+
+            async with ServerProcess(args.port, args.workers, env) as server:
+                # Startup traffic such as connection checks is not part of the measurement
+                rpc_server.reset_counters()
+                coingecko_server.reset_counters()
+
+                generator = TrafficGenerator(
+                    TrafficMix(address_set_sizes=args.address_set_sizes, repeat_rate=args.repeat_rate),
+                    seed=args.seed,
+                )
+                url = f"{server.url}/get_approvals" + (f"?{args.query}" if args.query else "")
+
+                started_at = time.monotonic()
+                results = await run_open_loop(url, args.rps, args.duration, generator, seed=args.seed)
+                elapsed = time.monotonic() - started_at
+
+                return build_report(
+                    results,
+                    duration_seconds=elapsed,
+                    rpc_calls=rpc_server.calls,
+                    coingecko_calls=coingecko_server.calls,
+                    upstream_rejections=rpc_server.rejected + coingecko_server.rejected,
+                    worker_memory=server.worker_memory_mb(),
+                )
+
+
+def main() -> None:
+    args = parse_loadtest_args()
+    setup_logging("INFO")
+
+    try:
+        report = asyncio.run(run_loadtest(args))
+        print(report.model_dump_json(indent=2) if args.json else format_report(report))
+        sys.exit(0)
+
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user", file=sys.stderr)
+        sys.exit(130)
+
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,22 +8,52 @@ from approvalfetcher.clients.coingecko_client import CoinGeckoClient
 from approvalfetcher.clients.web3_client import Web3Client
 from approvalfetcher.routes.approval import router as approval_router
 from approvalfetcher.routes.system import router as system_router
-from approvalfetcher.services.approval_service import ApprovalService
-from approvalfetcher.services.price_service import PriceService
+from approvalfetcher.services.cache_backend import create_cache_backend
+from approvalfetcher.services.chain_registry import ChainRegistry, ChainServices
+from approvalfetcher.services.price_refresher import PriceRefresher
+from approvalfetcher.services.response_cache import ResponseCache
+from approvalfetcher.utils.chains import get_chain
+from approvalfetcher.utils.config import get_settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    settings = get_settings()
+
     async with AsyncExitStack() as stack:
-        web3_client = await stack.enter_async_context(Web3Client())
+        cache = await stack.enter_async_context(
+            create_cache_backend(settings.cache_backend, settings.cache_sqlite_path)
+        )
         coingecko_client = await stack.enter_async_context(CoinGeckoClient())
 
-        app.state.web3_client = web3_client
+        chain_registry = ChainRegistry()
+        for chain_name in settings.enabled_chains:
+            chain = get_chain(chain_name)
+            web3_client = await stack.enter_async_context(Web3Client(chain))
+            chain_registry.register(ChainServices(chain, web3_client, coingecko_client, cache))
+
         app.state.coingecko_client = coingecko_client
-        app.state.approval_service = ApprovalService(web3_client)
-        app.state.price_service = PriceService(coingecko_client)
+        app.state.chain_registry = chain_registry
+        app.state.response_cache = ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            price_ttl_seconds=settings.response_cache_price_ttl_seconds,
+            cache=cache,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            # Unpriced snapshots roll over once spender classifications may have expired
+            max_age_seconds=settings.eoa_cache_ttl_seconds,
+        )
+
+        await stack.enter_async_context(PriceRefresher(
+            [chain_services.price_service for chain_services in chain_registry],
+            top_n=settings.price_refresh_top_n,
+            interval_seconds=settings.price_refresh_interval_seconds,
+            batch_size=settings.price_refresh_batch_size,
+            max_calls_per_minute=settings.price_refresh_max_calls_per_minute,
+            cache=cache,
+        ))
 
-        print("✓ Initialized Web3Client, CoinGeckoClient, ApprovalService, and PriceService")
+        print(f"✓ Initialized {settings.cache_backend} cache, CoinGeckoClient, PriceRefresher, ResponseCache "
+              f"and chains: {', '.join(settings.enabled_chains)}")
         yield
         print("✓ Cleaned up clients")
 
@@ -1,20 +1,34 @@
 from pydantic import BaseModel, Field, AfterValidator
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Optional
 
 from typing import Annotated
 from approvalfetcher.utils.valdation.eth_validtor import eth_address
 EvmAddress = Annotated[str, AfterValidator(eth_address)]
 
+class SpenderType(str, Enum):
+    EOA = "eoa"
+    CONTRACT = "contract"
+    DESTROYED_CONTRACT = "destroyed_contract"
+
 class ApprovalEvent(BaseModel):
     token_address: EvmAddress
     token_symbol: Optional[str] = Field(None, description="Token symbol (optional)")
     spender: EvmAddress
     value: str = Field(..., description="Approved amount in wei (as string to preserve precision)")
+    block_number: Optional[int] = Field(default=None, description="Block the approval was emitted in")
+    log_index: Optional[int] = Field(default=None, description="Position of the approval log in its block")
+    transaction_hash: Optional[str] = Field(default=None, description="Hash of the transaction that emitted the approval")
+    block_timestamp: Optional[datetime] = Field(default=None, description="Timestamp of the approval block")
+    spender_type: Optional[SpenderType] = Field(default=None, description="Whether the spender is an EOA, a contract or a destroyed contract")
+    spender_code_hash: Optional[str] = Field(default=None, description="Keccak hash of the spender code, None for EOAs")
 
 class ApprovalEvents(BaseModel):
     address: EvmAddress
+    chain: str = Field(default="ethereum", description="Chain the events were scanned on")
     total_events: int = Field(..., description="Total number of approval events found")
     scanned_blocks: int = Field(..., description="Total number of blocks scanned")
+    last_approval_block: int = Field(default=0, description="Newest block holding an Approval of the address, as of the scan")
     events: list[ApprovalEvent] = Field(default_factory=list, description="List of approval events")
     fetched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Timestamp of when data was fetched")
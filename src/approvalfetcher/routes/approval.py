@@ -1,34 +1,178 @@
-from typing import Annotated
+import asyncio
+import hashlib
+import http
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from approvalfetcher.dto.approval.approval_response import ApprovalsResponse, to_response
 from approvalfetcher.model.approval import EvmAddress
-from approvalfetcher.services.approval_service import ApprovalService
-from approvalfetcher.services.price_service import PriceService
-from approvalfetcher.services.dependencies import get_approval_service, get_price_service
+from approvalfetcher.services.chain_registry import ChainRegistry, ChainServices
+from approvalfetcher.services.pagination import (
+    ApprovalFilters,
+    ApprovalSnapshot,
+    Cursor,
+    check_position,
+    decode_cursor,
+    encode_cursor,
+    select_page,
+)
+from approvalfetcher.services.response_cache import ResponseCache
+from approvalfetcher.services.dependencies import get_chain_registry, get_response_cache
+from approvalfetcher.utils.chains import DEFAULT_CHAIN
 from approvalfetcher.utils.config import get_settings
-from approvalfetcher.utils.throttling import Throttling
 
 router = APIRouter(prefix="", tags=["approvals"])
 settings = get_settings()
-throttler = Throttling(max_tasks=settings.max_concurrent_tasks)
 
 
-@router.post("/get_approvals")
+def _chain_blocks(chain_services_list: list[ChainServices], blocks: list[Optional[int]]) -> Optional[dict[str, int]]:
+    if any(block is None for block in blocks):
+        return None
+    return {
+        chain_services.chain.name: block
+        for chain_services, block in zip(chain_services_list, blocks) if block is not None
+    }
+
+
+async def _probe_approval_blocks(chain_services_list: list[ChainServices], addresses: set[str]) -> Optional[dict[str, int]]:
+    blocks = await asyncio.gather(*[
+        chain_services.approval_service.probe_last_approval_block(addresses)
+        for chain_services in chain_services_list
+    ])
+    return _chain_blocks(chain_services_list, blocks)
+
+
+async def _scan(
+        chain_services_list: list[ChainServices],
+        addresses: set[str],
+        get_token_price: bool,
+        cap_to_balance: bool,
+        pinned_blocks: Optional[dict[str, int]]
+) -> ApprovalSnapshot:
+    # Chains are scanned concurrently, so latency follows the slowest chain rather than the sum
+    scans = await asyncio.gather(*[
+        chain_services.scan(
+            addresses,
+            get_token_price,
+            cap_to_balance,
+            pinned_blocks.get(chain_services.chain.name) if pinned_blocks is not None else None
+        )
+        for chain_services in chain_services_list
+    ])
+
+    balances = None
+    if cap_to_balance:
+        balances = {key: balance for scan in scans for key, balance in (scan.balances or {}).items()}
+
+    # Keyed by the blocks this scan saw, the shared scan state may already be ahead of them
+    scanned_blocks = {
+        chain_services.chain.name: max((ae.last_approval_block for ae in scan.approval_events_list), default=0)
+        for chain_services, scan in zip(chain_services_list, scans)
+    }
+
+    return ApprovalSnapshot(
+        last_blocks=pinned_blocks if pinned_blocks is not None else scanned_blocks,
+        approval_events_list=[ae for scan in scans for ae in scan.approval_events_list],
+        prices={key: price for scan in scans for key, price in scan.prices.items()},
+        decimals={key: value for scan in scans for key, value in scan.decimals.items()},
+        balances=balances,
+    )
+
+
+def _fingerprint(*query: object) -> str:
+    return hashlib.sha256(repr(query).encode()).hexdigest()[:16]
+
+
+@router.post("/get_approvals", response_model=ApprovalsResponse)
 async def get_approvals(
         addresses: set[EvmAddress],
-        approval_service: Annotated[ApprovalService, Depends(get_approval_service)],
-        price_service: Annotated[PriceService, Depends(get_price_service)],
-        get_token_price: bool = True
-) -> ApprovalsResponse:
-    approval_events_list = await throttler.submit(addresses, approval_service.fetch_all_approvals)
-
-    prices = None
-    if get_token_price and approval_events_list:
-        all_events = [event for ae in approval_events_list for event in ae.events]
-        if all_events:
-            token_addresses = [event.token_address for event in all_events]
-            prices = await price_service.fetch_prices(token_addresses)
-
-    return to_response(approval_events_list, prices)
+        response: Response,
+        chain_registry: Annotated[ChainRegistry, Depends(get_chain_registry)],
+        response_cache: Annotated[ResponseCache, Depends(get_response_cache)],
+        chains: Annotated[Optional[list[str]], Query()] = None,
+        get_token_price: bool = True,
+        cap_to_balance: bool = False,
+        sort_by_exposure: bool = False,
+        token: Annotated[Optional[list[EvmAddress]], Query()] = None,
+        spender: Annotated[Optional[list[EvmAddress]], Query()] = None,
+        min_value: Annotated[Optional[int], Query(ge=0)] = None,
+        unlimited_only: bool = False,
+        limit: Annotated[Optional[int], Query(ge=1, le=settings.max_page_size)] = None,
+        cursor: Optional[str] = None,
+        if_none_match: Annotated[Optional[str], Header()] = None
+) -> ApprovalsResponse | Response:
+    try:
+        chain_services_list = [chain_registry.get(chain) for chain in dict.fromkeys(chains or [DEFAULT_CHAIN])]
+    except ValueError as e:
+        raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e))
+
+    filters = ApprovalFilters(
+        tokens={address.lower() for address in token or []},
+        spenders={address.lower() for address in spender or []},
+        min_value=min_value,
+        unlimited_only=unlimited_only,
+    )
+    fingerprint = _fingerprint(
+        sorted(address.lower() for address in addresses),
+        sorted(chain_services.chain.name for chain_services in chain_services_list),
+        get_token_price,
+        cap_to_balance,
+        sort_by_exposure,
+        filters.model_dump_json(),
+    )
+
+    # A cursor pins every page to the snapshot of the first one
+    after = None
+    pinned_blocks = None
+    pinned_epoch = None
+    if cursor is not None:
+        try:
+            decoded = decode_cursor(cursor)
+            check_position(decoded.position, sort_by_exposure)
+        except ValueError as e:
+            raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail=str(e))
+        if decoded.fingerprint != fingerprint:
+            raise HTTPException(status_code=http.HTTPStatus.BAD_REQUEST, detail="Cursor does not match this query")
+        after = decoded.position
+        pinned_blocks = decoded.snapshot
+        pinned_epoch = decoded.epoch
+
+    last_blocks = pinned_blocks or await _probe_approval_blocks(chain_services_list, addresses)
+
+    snapshot = None
+    epoch = pinned_epoch if pinned_epoch is not None else response_cache.epoch(get_token_price, cap_to_balance)
+    if last_blocks is not None:
+        key = response_cache.key(addresses, get_token_price, last_blocks, cap_to_balance, epoch)
+        etag = response_cache.etag(key, fingerprint, cursor, limit)
+        if response_cache.matches(etag, if_none_match):
+            return Response(status_code=http.HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        snapshot = await response_cache.get(key)
+
+    if snapshot is None:
+        # Exposure ranks of a rescan use new prices and balances, so a later page would skip or
+        # repeat rows. Ordering by (chain, owner, block, log index) is stable across rescans.
+        if after is not None and sort_by_exposure:
+            raise HTTPException(
+                status_code=http.HTTPStatus.GONE,
+                detail="Cursor snapshot expired, request the first page again",
+            )
+        snapshot = await _scan(chain_services_list, addresses, get_token_price, cap_to_balance, pinned_blocks)
+        epoch = response_cache.epoch(get_token_price, cap_to_balance)
+        key = response_cache.key(addresses, get_token_price, snapshot.last_blocks, cap_to_balance, epoch)
+        await response_cache.put(key, snapshot)
+
+    page = select_page(snapshot, filters, sort_by_exposure, after, limit)
+    next_cursor = None
+    if page.next_position is not None:
+        next_cursor = encode_cursor(Cursor(snapshot.last_blocks, page.next_position, fingerprint, epoch))
+
+    response.headers["ETag"] = response_cache.etag(key, fingerprint, cursor, limit)
+    return to_response(
+        page.approval_events_list,
+        snapshot.prices,
+        snapshot.decimals,
+        snapshot.balances,
+        total=page.total,
+        next_cursor=next_cursor
+    )
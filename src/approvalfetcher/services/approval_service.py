@@ -1,59 +1,175 @@
-import asyncio
 import logging
 from datetime import datetime, timezone
+from typing import Awaitable, Callable, Iterable, Optional, TypeVar
 from web3.types import LogReceipt
 
 from ..clients.web3_client import Web3Client
 from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents
+from .cache_backend import CacheBackend, InMemoryCache
 from ..utils.config import get_settings
+from ..utils.constants import UNKNOWN_TOKEN_SYMBOL
 from ..utils.formatters import normalize_approval_amount
+from ..utils.throttling import Throttling
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class ApprovalService:
 
-    def __init__(self, client: Web3Client):
+    def __init__(self, client: Web3Client, cache: Optional[CacheBackend] = None):
         self.client = client
         self.settings = get_settings()
-
-    async def fetch_all_approvals(self, owner_address: str) -> ApprovalEvents:
+        self.cache = cache or InMemoryCache()
+        chain = self.client.chain.name
+        # owner -> (last scanned block, last block holding an Approval for the owner). Every scan
+        # and probe renews the TTL, owners nobody asks about any more expire and get a full rescan.
+        self._scans_namespace = f"{chain}:scans"
+        # symbol() and decimals() are immutable for a deployed token, so successful lookups are
+        # cached without a TTL. Failures may be transient and are fetched again next time.
+        self._symbols_namespace = f"{chain}:symbols"
+        self._decimals_namespace = f"{chain}:decimals"
+        self._rpc_throttler = Throttling(max_tasks=self.settings.max_concurrent_rpc_calls)
+
+    async def fetch_all_approvals(self, owner_address: str, to_block: Optional[int] = None) -> ApprovalEvents:
         logger.info(f"Starting approval event scan for address: {owner_address}")
 
-        logs = await self.client.get_all_approval_logs(owner_address)
+        latest_block = to_block if to_block is not None else await self.client.get_latest_block()
+        logs = await self.client.get_all_approval_logs(owner_address, latest_block)
         logger.info(f"Retrieved {len(logs)} total approval events")
 
-        tasks = [self._parse_log_to_event(log, owner_address) for log in logs]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        symbols = await self.fetch_token_symbols(log['address'] for log in logs)
 
         events_with_block: list[tuple[ApprovalEvent, int]] = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                tx_hash = logs[i].get('transactionHash')
+        for log in logs:
+            try:
+                event = self._parse_log_to_event(log, symbols)
+            except Exception as e:
+                tx_hash = log.get('transactionHash')
                 tx_hash_str = tx_hash.hex() if isinstance(tx_hash, bytes) else str(tx_hash)
-                logger.warning(f"Failed to parse log {tx_hash_str}: {result}")
+                logger.warning(f"Failed to parse log {tx_hash_str}: {e}")
             else:
-                assert isinstance(result, ApprovalEvent)
-                block_number = logs[i]['blockNumber']
+                block_number = log['blockNumber']
                 block_num_int = int(block_number) if isinstance(block_number, int) else block_number
-                events_with_block.append((result, block_num_int))
+                events_with_block.append((event, block_num_int))
 
         logger.info(f"Successfully parsed {len(events_with_block)} approval events")
 
+        last_approval_block = max((int(log['blockNumber']) for log in logs), default=0)
+        await self._record_scans({owner_address.lower(): (latest_block, last_approval_block)})
+
         latest_approvals = self._filter_latest_approvals(events_with_block)
         logger.info(f"After filtering duplicates: {len(latest_approvals)} unique approvals remain")
 
-        latest_block = await self.client.get_latest_block()
-
         return ApprovalEvents(
             address=owner_address.lower(),
+            chain=self.client.chain.name,
             total_events=len(latest_approvals),
             scanned_blocks=latest_block + 1,
+            last_approval_block=last_approval_block,
             events=latest_approvals,
             fetched_at=datetime.now(timezone.utc)
         )
 
-    async def _parse_log_to_event(self, log: LogReceipt, owner_address: str) -> ApprovalEvent:
+    async def fetch_token_symbols(self, token_addresses: Iterable[str]) -> dict[str, str]:
+        async def fetch(addresses: list[str]) -> list[str]:
+            return await self._rpc_throttler.submit(addresses, self.client.get_token_symbol)
+
+        return await self._fetch_token_metadata(
+            token_addresses, self._symbols_namespace, fetch,
+            cacheable=lambda symbol: symbol != UNKNOWN_TOKEN_SYMBOL,
+        )
+
+    async def fetch_token_decimals(self, token_addresses: Iterable[str]) -> dict[str, Optional[int]]:
+        return await self._fetch_token_metadata(
+            token_addresses, self._decimals_namespace, self.client.get_multiple_token_decimals,
+            cacheable=lambda decimals: decimals is not None,
+        )
+
+    async def _fetch_token_metadata(
+        self,
+        token_addresses: Iterable[str],
+        namespace: str,
+        fetch: Callable[[list[str]], Awaitable[list[T]]],
+        cacheable: Callable[[T], bool]
+    ) -> dict[str, T]:
+        """Look token metadata up in the cache and fetch what is missing, keyed by lowercase address."""
+        addresses = {address.lower(): address for address in token_addresses}
+        values: dict[str, T] = await self.cache.get_many(namespace, addresses)
+
+        missing = [address for key, address in addresses.items() if key not in values]
+        if missing:
+            logger.info(f"Fetching {namespace} for {len(missing)} tokens, {len(values)} served from cache")
+            results = await fetch(missing)
+            fetched = {address.lower(): value for address, value in zip(missing, results)}
+            values.update(fetched)
+            await self.cache.set_many(namespace, {key: value for key, value in fetched.items() if cacheable(value)})
+
+        return values
+
+    async def fetch_balances(self, holdings: Iterable[tuple[str, str]]) -> dict[tuple[str, str], Optional[int]]:
+        """Fetch balanceOf for distinct (owner, token) pairs in JSON-RPC batches, keyed by lowercase addresses."""
+        unique = list({(owner.lower(), token.lower()) for owner, token in holdings})
+        results = await self.client.get_multiple_token_balances([(token, owner) for owner, token in unique])
+        return dict(zip(unique, results))
+
+    async def probe_last_approval_block(self, owner_addresses: Iterable[str]) -> Optional[int]:
+        """
+        Bring the per-owner scan state up to the chain head and return the newest Approval block.
+
+        Only the blocks mined since the previous scan are queried, with one eth_getLogs call
+        covering every owner, so this is cheap compared to a full rescan. Scan state written
+        by another worker sharing the cache counts as scanned.
+        """
+        owners = [owner.lower() for owner in owner_addresses]
+        states = await self._load_scans(owners)
+        if not owners or len(states) < len(set(owners)):
+            return None
+
+        latest_block = await self.client.get_latest_block()
+        from_block = min(state[0] for state in states.values()) + 1
+
+        if from_block <= latest_block:
+            logs = await self.client.get_approval_logs(owners, from_block, latest_block)
+            new_blocks: dict[str, int] = {}
+            for log in logs:
+                owner = "0x" + log['topics'][1].hex()[-40:].lower()
+                new_blocks[owner] = max(new_blocks.get(owner, 0), int(log['blockNumber']))
+
+            states = await self._record_scans({owner: (latest_block, new_blocks.get(owner, 0)) for owner in owners})
+
+        # The merged state is used as is, re-reading could observe an older write by another worker
+        return self._last_approval_block(owners, states)
+
+    async def _record_scans(self, scans: dict[str, tuple[int, int]]) -> dict[str, tuple[int, int]]:
+        """
+        Merge (scanned to, last Approval block) per lowercase owner into the scan state.
+
+        Every state is consistent on its own, a state scanned up to block N holds every Approval
+        up to N. When two workers race the older write may win, which only costs a wider probe.
+        """
+        previous = await self._load_scans(scans)
+        merged = {}
+        for owner, (scanned_to, last_approval_block) in scans.items():
+            previous_scanned, previous_last = previous.get(owner, (-1, 0))
+            merged[owner] = (max(previous_scanned, scanned_to), max(previous_last, last_approval_block))
+
+        await self.cache.set_many(self._scans_namespace, merged, ttl_seconds=self.settings.scan_state_ttl_seconds)
+        return merged
+
+    async def _load_scans(self, owners: Iterable[str]) -> dict[str, tuple[int, int]]:
+        states = await self.cache.get_many(self._scans_namespace, owners)
+        return {owner: (int(state[0]), int(state[1])) for owner, state in states.items()}
+
+    @staticmethod
+    def _last_approval_block(owners: list[str], states: dict[str, tuple[int, int]]) -> Optional[int]:
+        if any(owner not in states for owner in owners):
+            return None
+        return max((states[owner][1] for owner in owners), default=0)
+
+    @staticmethod
+    def _parse_log_to_event(log: LogReceipt, symbols: dict[str, str]) -> ApprovalEvent:
         topics = log['topics']
 
         spender_topic = topics[2].hex()
@@ -62,15 +178,21 @@ class ApprovalService:
         data = log['data'].hex()
         token_address = log['address']
 
-        token_symbol = await self.client.get_token_symbol(token_address)
+        token_symbol = symbols.get(token_address.lower(), UNKNOWN_TOKEN_SYMBOL)
 
         value = normalize_approval_amount(data)
 
+        tx_hash = log['transactionHash']
+        tx_hash_str = tx_hash.hex() if isinstance(tx_hash, bytes) else str(tx_hash)
+
         return ApprovalEvent(
             token_address=token_address,
             token_symbol=token_symbol,
             spender=spender.lower(),
-            value=value
+            value=value,
+            block_number=int(log['blockNumber']),
+            log_index=int(log['logIndex']),
+            transaction_hash=tx_hash_str if tx_hash_str.startswith("0x") else f"0x{tx_hash_str}"
         )
 
     @staticmethod
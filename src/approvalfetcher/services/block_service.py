@@ -0,0 +1,49 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+
+from ..clients.web3_client import Web3Client
+from .cache_backend import CacheBackend, InMemoryCache
+
+logger = logging.getLogger(__name__)
+
+
+class BlockHeaderResolver:
+    """
+    Resolves block timestamps for many blocks at once.
+
+    Block numbers are deduplicated and fetched as batched header requests. Finalized headers
+    can no longer be reorged away, so their timestamps are cached without a TTL; newer blocks
+    are fetched again on every call.
+    """
+
+    def __init__(self, client: Web3Client, cache: Optional[CacheBackend] = None):
+        self.client = client
+        self.cache = cache or InMemoryCache()
+        self._namespace = f"{client.chain.name}:timestamps"
+
+    async def resolve_timestamps(self, block_numbers: Iterable[int]) -> dict[int, int]:
+        unique_blocks = set(block_numbers)
+        cached = await self.cache.get_many(self._namespace, (str(block) for block in unique_blocks))
+        resolved = {int(block): timestamp for block, timestamp in cached.items()}
+
+        missing = sorted(unique_blocks - resolved.keys())
+        if not missing:
+            return resolved
+
+        logger.info(f"Fetching {len(missing)} block headers, {len(resolved)} served from cache")
+        finalized_block, timestamps = await asyncio.gather(
+            self.client.get_finalized_block_number(),
+            self.client.get_block_timestamps(missing),
+        )
+
+        finalized: dict[str, int] = {}
+        for block, timestamp in zip(missing, timestamps):
+            if timestamp is None:
+                continue
+            resolved[block] = timestamp
+            if block <= finalized_block:
+                finalized[str(block)] = timestamp
+
+        await self.cache.set_many(self._namespace, finalized)
+        return resolved
@@ -0,0 +1,248 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stays well below SQLite's bound parameter limit
+SQLITE_MAX_KEYS_PER_QUERY = 500
+
+
+class CacheBackend(ABC):
+    """
+    Namespaced key-value store with optional per-entry TTLs.
+
+    Expiry uses wall clock time so entries written by one process are valid in another.
+    Missing and expired keys are simply absent from get_many results, which lets None be
+    cached like any other value. Values must be JSON serializable, a shared backend returns
+    tuples as lists and callers convert them back.
+    """
+
+    # Whether other processes see what this backend stores
+    shared = False
+
+    async def __aenter__(self) -> "CacheBackend":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        pass
+
+    @abstractmethod
+    async def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, Any]:
+        ...
+
+    @abstractmethod
+    async def set_many(self, namespace: str, values: dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def increment(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        """Atomically add one to a counter, starting from zero when it is missing or expired. The TTL restarts."""
+        ...
+
+    async def get(self, namespace: str, key: str) -> Optional[Any]:
+        return (await self.get_many(namespace, [key])).get(key)
+
+    async def set(self, namespace: str, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        await self.set_many(namespace, {key: value}, ttl_seconds)
+
+
+class InMemoryCache(CacheBackend):
+    """Per-process cache, every worker keeps its own copy. Expired entries are purged on write."""
+
+    def __init__(self, purge_interval_seconds: float = 60.0) -> None:
+        # (namespace, key) -> (value, wall clock expiry or None for permanent entries)
+        self._entries: dict[tuple[str, str], tuple[Any, Optional[float]]] = {}
+        self.purge_interval_seconds = purge_interval_seconds
+        self._last_purge = 0.0
+
+    async def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, Any]:
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                continue
+            if entry[1] is not None and entry[1] <= now:
+                del self._entries[(namespace, key)]
+                continue
+            found[key] = entry[0]
+        return found
+
+    async def set_many(self, namespace: str, values: dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        for key, value in values.items():
+            self._entries[(namespace, key)] = (value, expires_at)
+
+        if now - self._last_purge >= self.purge_interval_seconds:
+            expired = [entry_key for entry_key, (_, expiry) in self._entries.items() if expiry is not None and expiry <= now]
+            for entry_key in expired:
+                del self._entries[entry_key]
+            self._last_purge = now
+            logger.debug(f"Purged {len(expired)} expired cache entries")
+
+    async def increment(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        # Nothing awaits in between, so no other task can interleave
+        count = int((await self.get(namespace, key)) or 0) + 1
+        await self.set(namespace, key, count, ttl_seconds)
+        return count
+
+
+class SqliteCache(CacheBackend):
+    """
+    Host-local cache in an SQLite database that every worker on the host opens.
+
+    WAL mode lets workers read while another one writes, so an upstream fetch by one worker
+    warms all of them. Queries run in a thread to keep lock waits off the event loop and
+    expired rows are purged on write at most once per purge interval.
+
+    Values are stored as JSON, a row that does not decode is treated as a miss. The database
+    directory is created private to the service user, and a file owned by another user is
+    refused, so other local users cannot plant entries.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, busy_timeout_seconds: float = 5.0, purge_interval_seconds: float = 60.0):
+        self.path = path
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    async def __aenter__(self) -> "SqliteCache":
+        self._connection = await asyncio.to_thread(self._connect)
+        logger.info(f"Opened shared cache at {self.path}")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self._prepare_file()
+        connection = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL stays consistent with NORMAL, a power loss may only drop the latest writes
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL,"
+            " PRIMARY KEY (namespace, key)"
+            ") WITHOUT ROWID"
+        )
+        return connection
+
+    def _prepare_file(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # SQLite creates the -wal and -shm files with the permissions of the database file
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            owner = os.fstat(descriptor).st_uid
+        finally:
+            os.close(descriptor)
+
+        if hasattr(os, "getuid") and owner != os.getuid():
+            raise PermissionError(f"Cache database {self.path} is owned by uid {owner}, not by the service user")
+
+    def _require_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("SqliteCache is not open, use it as an async context manager")
+        return self._connection
+
+    async def get_many(self, namespace: str, keys: Iterable[str]) -> dict[str, Any]:
+        unique_keys = list(dict.fromkeys(keys))
+        if not unique_keys:
+            return {}
+        return await asyncio.to_thread(self._get_many, namespace, unique_keys)
+
+    def _get_many(self, namespace: str, keys: list[str]) -> dict[str, Any]:
+        connection = self._require_connection()
+        now = time.time()
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), SQLITE_MAX_KEYS_PER_QUERY):
+                chunk = keys[start:start + SQLITE_MAX_KEYS_PER_QUERY]
+                rows = connection.execute(
+                    f"SELECT key, value FROM cache WHERE namespace = ? AND key IN ({', '.join('?' * len(chunk))})"
+                    " AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, *chunk, now),
+                ).fetchall()
+                for key, value in rows:
+                    try:
+                        found[key] = json.loads(value)
+                    except (ValueError, TypeError):
+                        logger.warning(f"Ignoring undecodable cache entry {namespace}/{key}")
+        return found
+
+    async def set_many(self, namespace: str, values: dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        if values:
+            await asyncio.to_thread(self._set_many, namespace, values, ttl_seconds)
+
+    def _set_many(self, namespace: str, values: dict[str, Any], ttl_seconds: Optional[float]) -> None:
+        connection = self._require_connection()
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        rows = [
+            (namespace, key, json.dumps(value), expires_at)
+            for key, value in values.items()
+        ]
+        with self._lock:
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+                if now - self._last_purge >= self.purge_interval_seconds:
+                    purged = connection.execute("DELETE FROM cache WHERE expires_at <= ?", (now,)).rowcount
+                    self._last_purge = now
+                    logger.debug(f"Purged {purged} expired cache entries")
+
+    async def increment(self, namespace: str, key: str, ttl_seconds: Optional[float] = None) -> int:
+        return await asyncio.to_thread(self._increment, namespace, key, ttl_seconds)
+
+    def _increment(self, namespace: str, key: str, ttl_seconds: Optional[float]) -> int:
+        connection = self._require_connection()
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds is not None else None
+        with self._lock:
+            with connection:
+                # The write lock is taken before reading, so workers cannot both read the same count
+                connection.execute("BEGIN IMMEDIATE")
+                row = connection.execute(
+                    "SELECT value FROM cache WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, key, now),
+                ).fetchone()
+                try:
+                    count = int(json.loads(row[0])) + 1 if row is not None else 1
+                except (ValueError, TypeError):
+                    count = 1
+                connection.execute(
+                    "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", (namespace, key, json.dumps(count), expires_at)
+                )
+        return count
+
+
+def create_cache_backend(name: str, sqlite_path: str) -> CacheBackend:
+    if name == "memory":
+        return InMemoryCache()
+    if name == "sqlite":
+        return SqliteCache(sqlite_path)
+    raise ValueError(f"Unknown cache backend {name}, available: memory, sqlite")
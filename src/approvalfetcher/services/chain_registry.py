@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Iterator, NamedTuple, Optional
+
+from ..clients.coingecko_client import CoinGeckoClient
+from ..clients.web3_client import Web3Client
+from approvalfetcher.model.approval import ApprovalEvents
+from .approval_service import ApprovalService
+from .block_service import BlockHeaderResolver
+from .cache_backend import CacheBackend
+from .price_service import PriceService
+from .spender_service import SpenderService
+from ..utils.chains import ChainConfig
+from ..utils.config import get_settings
+from ..utils.throttling import Throttling
+
+logger = logging.getLogger(__name__)
+
+
+class ChainScan(NamedTuple):
+    approval_events_list: list[ApprovalEvents]
+    prices: dict[tuple[str, str], Optional[float]]
+    decimals: dict[tuple[str, str], Optional[int]]
+    balances: Optional[dict[tuple[str, str, str], Optional[int]]]
+
+
+class ChainServices:
+    """Clients, services and throttling for a single chain."""
+
+    def __init__(
+        self,
+        chain: ChainConfig,
+        web3_client: Web3Client,
+        coingecko_client: CoinGeckoClient,
+        cache: Optional[CacheBackend] = None
+    ):
+        self.settings = get_settings()
+        self.chain = chain
+        self.web3_client = web3_client
+        self.approval_service = ApprovalService(web3_client, cache)
+        self.price_service = PriceService(
+            coingecko_client,
+            ttl_seconds=self.settings.price_cache_ttl_seconds,
+            platform=chain.coingecko_platform,
+            cache=cache,
+            max_stale_seconds=self.settings.price_max_stale_seconds,
+        )
+        self.block_resolver = BlockHeaderResolver(web3_client, cache)
+        self.spender_service = SpenderService(
+            web3_client,
+            eoa_ttl_seconds=self.settings.eoa_cache_ttl_seconds,
+            cache=cache,
+        )
+        self.throttler = Throttling(max_tasks=self.settings.max_concurrent_tasks)
+
+        if chain.start_block > 0:
+            logger.warning(f"Approvals on {chain.name} are scanned from block {chain.start_block}, "
+                           f"older approvals are not reported")
+
+    async def scan(
+        self,
+        addresses: set[str],
+        get_token_price: bool,
+        cap_to_balance: bool,
+        to_block: Optional[int] = None
+    ) -> ChainScan:
+        """
+        Fetch approvals and their token data, keyed by chain so scans of several chains can be merged.
+
+        to_block pins the scan to an earlier snapshot, by default it runs up to the chain head.
+        """
+        name = self.chain.name
+
+        async def fetch(owner_address: str) -> ApprovalEvents:
+            return await self.approval_service.fetch_all_approvals(owner_address, to_block)
+
+        approval_events_list = await self.throttler.submit(addresses, fetch)
+
+        all_events = [event for ae in approval_events_list for event in ae.events]
+        if not all_events:
+            return ChainScan(approval_events_list, {}, {}, None)
+
+        token_addresses = [event.token_address for event in all_events]
+        spender_blocks: dict[str, Optional[int]] = {event.spender: event.block_number for event in all_events}
+        decimals, spenders, timestamps = await asyncio.gather(
+            self.approval_service.fetch_token_decimals(token_addresses),
+            self.spender_service.classify(spender_blocks),
+            self.block_resolver.resolve_timestamps(
+                event.block_number for event in all_events if event.block_number is not None
+            ),
+        )
+
+        for event in all_events:
+            spender_info = spenders.get(event.spender.lower())
+            if spender_info is not None:
+                event.spender_type, event.spender_code_hash = spender_info
+            if event.block_number is not None and event.block_number in timestamps:
+                event.block_timestamp = datetime.fromtimestamp(timestamps[event.block_number], timezone.utc)
+
+        prices: dict[str, Optional[float]] = {}
+        if get_token_price:
+            prices = await self.price_service.fetch_prices(token_addresses)
+
+        balances = None
+        if cap_to_balance:
+            owner_balances = await self.approval_service.fetch_balances(
+                (ae.address, event.token_address) for ae in approval_events_list for event in ae.events
+            )
+            balances = {(name, owner, token): balance for (owner, token), balance in owner_balances.items()}
+
+        return ChainScan(
+            approval_events_list,
+            {(name, token): price for token, price in prices.items()},
+            {(name, token): value for token, value in decimals.items()},
+            balances,
+        )
+
+
+class ChainRegistry:
+
+    def __init__(self) -> None:
+        self._chains: dict[str, ChainServices] = {}
+
+    def register(self, chain_services: ChainServices) -> None:
+        self._chains[chain_services.chain.name] = chain_services
+        logger.info(f"Registered chain {chain_services.chain.name} (id {chain_services.chain.chain_id})")
+
+    def get(self, name: str) -> ChainServices:
+        chain_services = self._chains.get(name)
+        if chain_services is None:
+            raise ValueError(f"Chain {name} is not enabled, available: {', '.join(self._chains)}")
+        return chain_services
+
+    def __iter__(self) -> Iterator[ChainServices]:
+        return iter(self._chains.values())
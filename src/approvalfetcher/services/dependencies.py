@@ -1,18 +1,14 @@
 from typing import cast
 from fastapi import Request
-from approvalfetcher.clients.web3_client import Web3Client
 from approvalfetcher.clients.coingecko_client import CoinGeckoClient
-from approvalfetcher.services.approval_service import ApprovalService
-from approvalfetcher.services.price_service import PriceService
-
-def get_web3_client(request: Request) -> Web3Client:
-    return cast(Web3Client, request.app.state.web3_client)
+from approvalfetcher.services.chain_registry import ChainRegistry
+from approvalfetcher.services.response_cache import ResponseCache
 
 def get_coingecko_client(request: Request) -> CoinGeckoClient:
     return cast(CoinGeckoClient, request.app.state.coingecko_client)
 
-def get_approval_service(request: Request) -> ApprovalService:
-    return cast(ApprovalService, request.app.state.approval_service)
+def get_chain_registry(request: Request) -> ChainRegistry:
+    return cast(ChainRegistry, request.app.state.chain_registry)
 
-def get_price_service(request: Request) -> PriceService:
-    return cast(PriceService, request.app.state.price_service)
+def get_response_cache(request: Request) -> ResponseCache:
+    return cast(ResponseCache, request.app.state.response_cache)
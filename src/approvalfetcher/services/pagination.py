@@ -0,0 +1,147 @@
+import base64
+import binascii
+import bisect
+import json
+from typing import Any, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+
+from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents
+from ..utils.exposure import compute_exposures, exposure_rank
+from ..utils.formatters import THRESHOLD
+
+
+class ApprovalFilters(BaseModel):
+    tokens: set[str] = Field(default_factory=set, description="Only approvals of these tokens")
+    spenders: set[str] = Field(default_factory=set, description="Only approvals to these spenders")
+    min_value: Optional[int] = Field(None, description="Only approvals of at least this raw amount")
+    unlimited_only: bool = Field(False, description="Only unlimited approvals")
+
+    def matches(self, event: ApprovalEvent) -> bool:
+        if self.tokens and event.token_address.lower() not in self.tokens:
+            return False
+        if self.spenders and event.spender.lower() not in self.spenders:
+            return False
+
+        value = int(event.value, 0)
+        if self.min_value is not None and value < self.min_value:
+            return False
+        return not self.unlimited_only or value > THRESHOLD
+
+
+class ApprovalSnapshot(NamedTuple):
+    """Merged scan of every requested chain, as of the newest Approval block per chain."""
+    last_blocks: dict[str, int]
+    approval_events_list: list[ApprovalEvents]
+    prices: dict[tuple[str, str], Optional[float]]
+    decimals: dict[tuple[str, str], Optional[int]]
+    balances: Optional[dict[tuple[str, str, str], Optional[int]]]
+
+
+class Cursor(NamedTuple):
+    snapshot: dict[str, int]
+    position: tuple[Any, ...]
+    fingerprint: str
+    # Response cache epoch of the snapshot, so later pages see the same prices and balances
+    epoch: Optional[int] = None
+
+
+class ApprovalPage(NamedTuple):
+    approval_events_list: list[ApprovalEvents]
+    total: int
+    next_position: Optional[tuple[Any, ...]]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = json.dumps({"s": cursor.snapshot, "p": list(cursor.position), "f": cursor.fingerprint, "e": cursor.epoch})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return Cursor(
+            snapshot={str(chain): int(block) for chain, block in payload["s"].items()},
+            position=tuple(payload["p"]),
+            fingerprint=str(payload["f"]),
+            epoch=int(payload["e"]) if payload.get("e") is not None else None,
+        )
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, AttributeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def check_position(position: tuple[Any, ...], sort_by_exposure: bool) -> None:
+    """Raise ValueError unless a decoded cursor position has the shape of the sort key of select_page."""
+    # (chain, owner, block, log index), prefixed by the negated exposure rank when sorting by exposure
+    expected: list[tuple[type, ...]] = [(str,), (str,), (int,), (int,)]
+    if sort_by_exposure:
+        expected.insert(0, (int, float))
+
+    if len(position) != len(expected) or any(
+        isinstance(value, bool) or not isinstance(value, types)
+        for value, types in zip(position, expected)
+    ):
+        raise ValueError("Invalid cursor")
+
+
+def select_page(
+        snapshot: ApprovalSnapshot,
+        filters: ApprovalFilters,
+        sort_by_exposure: bool,
+        after: Optional[tuple[Any, ...]],
+        limit: Optional[int]
+) -> ApprovalPage:
+    """
+    Filter, order and slice the snapshot before any response model is built.
+
+    Rows are ordered by (chain, owner, block, log index), which is unique per approval. When
+    sorting by exposure the negated exposure rank is prepended, keeping the order total.
+    """
+    rows = [
+        (ae, event)
+        for ae in snapshot.approval_events_list
+        for event in ae.events
+        if filters.matches(event)
+    ]
+
+    keys: list[tuple[Any, ...]] = [
+        (ae.chain, ae.address.lower(), event.block_number or 0, event.log_index or 0)
+        for ae, event in rows
+    ]
+
+    if sort_by_exposure:
+        token_keys = [(ae.chain, event.token_address.lower()) for ae, event in rows]
+        balances = snapshot.balances
+        exposures = compute_exposures(
+            values=[int(event.value, 0) for _, event in rows],
+            decimals=[snapshot.decimals.get(token_key) for token_key in token_keys],
+            prices=[snapshot.prices.get(token_key) for token_key in token_keys],
+            balances=[
+                balances.get((chain, ae.address.lower(), token))
+                for (ae, _), (chain, token) in zip(rows, token_keys)
+            ] if balances is not None else None,
+        )
+        keys = [(-exposure_rank(exposure), *key) for key, exposure in zip(keys, exposures)]
+
+    ordered = sorted(zip(keys, rows), key=lambda item: item[0])
+    start = bisect.bisect_right([key for key, _ in ordered], after) if after is not None else 0
+    end = len(ordered) if limit is None else min(start + limit, len(ordered))
+    page = ordered[start:end]
+
+    next_position = page[-1][0] if page and end < len(ordered) else None
+    return ApprovalPage(_group_by_owner([row for _, row in page]), len(ordered), next_position)
+
+
+def _group_by_owner(rows: list[tuple[ApprovalEvents, ApprovalEvent]]) -> list[ApprovalEvents]:
+    # Consecutive rows of the same owner and chain share one group, so the page order is kept
+    groups: list[tuple[ApprovalEvents, list[ApprovalEvent]]] = []
+    for ae, event in rows:
+        if groups and groups[-1][0] is ae:
+            groups[-1][1].append(event)
+        else:
+            groups.append((ae, [event]))
+
+    return [
+        ae.model_copy(update={"events": events, "total_events": len(events)})
+        for ae, events in groups
+    ]
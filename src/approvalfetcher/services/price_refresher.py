@@ -0,0 +1,93 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Optional
+
+from .cache_backend import CacheBackend, InMemoryCache
+from .price_service import PriceService
+
+logger = logging.getLogger(__name__)
+
+
+class PriceRefresher:
+    """
+    Background task that re-fetches prices of the most requested tokens before they expire,
+    so the request path can serve them from memory. One refresher serves every chain so
+    they all share the same CoinGecko call budget.
+
+    Every worker runs its own refresher. Calls are counted per minute in the cache backend,
+    so with a shared backend the budget holds for the whole host rather than per worker.
+    Tokens left over once it is spent wait for the next cycle.
+    """
+
+    NAMESPACE = "price-refresher"
+
+    def __init__(
+        self,
+        price_services: list[PriceService],
+        top_n: int,
+        interval_seconds: int,
+        batch_size: int,
+        max_calls_per_minute: int,
+        cache: Optional[CacheBackend] = None,
+    ):
+        self.price_services = price_services
+        self.top_n = top_n
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_calls_per_minute = max_calls_per_minute
+        self.call_spacing_seconds = 60 / max_calls_per_minute
+        self.cache = cache or InMemoryCache()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def __aenter__(self) -> "PriceRefresher":
+        self._task = asyncio.create_task(self._run())
+        logger.info("Price refresher started")
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        logger.info("Price refresher stopped")
+
+    async def refresh_once(self) -> int:
+        refreshed = 0
+        calls = 0
+        budget_spent = False
+        for price_service in self.price_services:
+            hot = price_service.hot_tokens(self.top_n)
+            # Anything that would expire before the next cycle is refreshed now
+            due = await price_service.expiring(hot, within_seconds=self.interval_seconds) if not budget_spent else []
+
+            for start in range(0, len(due), self.batch_size):
+                if calls:
+                    await asyncio.sleep(self.call_spacing_seconds)
+                if not await self._reserve_call():
+                    logger.info(f"CoinGecko refresh budget of {self.max_calls_per_minute} calls per minute is "
+                                f"spent, deferring {len(due) - start} prices on {price_service.platform}")
+                    budget_spent = True
+                    break
+                refreshed += await price_service.refresh(due[start:start + self.batch_size])
+                calls += 1
+
+            price_service.decay_popularity()
+            logger.debug(f"Refreshed {len(due)} of {len(hot)} hot token prices on {price_service.platform}")
+
+        return refreshed
+
+    async def _reserve_call(self) -> bool:
+        """Count a call against the budget of the current minute, False once it is spent."""
+        minute = int(time.time() // 60)
+        calls = await self.cache.increment(self.NAMESPACE, str(minute), ttl_seconds=120)
+        return calls <= self.max_calls_per_minute
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception:
+                logger.exception("Price refresh failed")
+            await asyncio.sleep(self.interval_seconds)
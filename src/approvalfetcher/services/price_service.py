@@ -1,18 +1,126 @@
 import logging
-from typing import Optional
+import time
+from collections import Counter
+from typing import Iterable, Optional
 from ..clients.coingecko_client import CoinGeckoClient
+from .cache_backend import CacheBackend, InMemoryCache
+from ..utils.constants import COINGECKO_DEFAULT_PLATFORM
 
 logger = logging.getLogger(__name__)
 
 
 class PriceService:
 
-    def __init__(self, client: CoinGeckoClient):
+    def __init__(
+        self,
+        client: CoinGeckoClient,
+        ttl_seconds: int = 300,
+        platform: str = COINGECKO_DEFAULT_PLATFORM,
+        cache: Optional[CacheBackend] = None,
+        max_stale_seconds: int = 900
+    ):
         self.client = client
+        self.platform = platform
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds
+        # Prices fetched by other workers sharing the cache are picked up from there
+        self.cache = cache or InMemoryCache()
+        self._namespace = f"{platform}:prices"
+        # token address -> (price, wall clock time it was fetched)
+        self._prices: dict[str, tuple[Optional[float], float]] = {}
+        self._popularity: Counter[str] = Counter()
+        self._hot: set[str] = set()
 
     async def fetch_prices(self, token_addresses: list[str]) -> dict[str, Optional[float]]:
         if not token_addresses:
             return {}
 
-        unique_addresses = list(set(token_addresses))
-        return await self.client.get_multiple_prices(unique_addresses)
+        unique_addresses = {address.lower() for address in token_addresses}
+        self._popularity.update(unique_addresses)
+
+        now = time.time()
+        prices: dict[str, Optional[float]] = {}
+        missing: list[str] = []
+        for address in unique_addresses:
+            cached = self._prices.get(address)
+            if cached is not None and now - cached[1] < self.ttl_seconds:
+                prices[address] = cached[0]
+            else:
+                missing.append(address)
+
+        if missing:
+            # Another worker may have fetched or refreshed them already
+            shared = await self._adopt_shared(missing)
+            prices.update({address: price for address, (price, _) in shared.items()})
+            missing = [address for address in missing if address not in shared]
+
+        # Hot tokens are kept warm by the refresher, so a cached price is served past its TTL,
+        # up to max_stale_seconds in case the refresher keeps failing or is out of budget
+        stale: list[str] = []
+        for address in missing:
+            cached = self._prices.get(address)
+            if address in self._hot and cached is not None:
+                if now - cached[1] < self.max_stale_seconds:
+                    prices[address] = cached[0]
+                else:
+                    stale.append(address)
+        missing = [address for address in missing if address not in prices]
+
+        if stale:
+            logger.warning(f"{len(stale)} hot token prices on {self.platform} are older than "
+                           f"{self.max_stale_seconds}s, fetching them inline")
+
+        if missing:
+            logger.debug(f"Fetching {len(missing)} prices inline, {len(prices)} served from cache")
+            fetched = await self.client.get_multiple_prices(missing, self.platform)
+            # A failed lookup comes back as None, so it is retried on the next request instead of
+            # hiding the price from every worker for a whole TTL
+            await self._store({address: price for address, price in fetched.items() if price is not None})
+            prices.update(fetched)
+
+        return prices
+
+    def hot_tokens(self, limit: int) -> list[str]:
+        self._hot = {address for address, _ in self._popularity.most_common(limit)}
+        return list(self._hot)
+
+    async def expiring(self, token_addresses: Iterable[str], within_seconds: float) -> list[str]:
+        now = time.time()
+
+        def is_due(address: str) -> bool:
+            cached = self._prices.get(address)
+            return cached is None or now - cached[1] >= self.ttl_seconds - within_seconds
+
+        # Another worker may have refreshed some of them already
+        due = [address for address in token_addresses if is_due(address)]
+        if due:
+            await self._adopt_shared(due)
+        return [address for address in due if is_due(address)]
+
+    def decay_popularity(self) -> None:
+        # Halve every score so popularity reflects recent responses rather than all-time totals
+        self._popularity = Counter({
+            address: count // 2 for address, count in self._popularity.items() if count > 1
+        })
+
+    async def refresh(self, token_addresses: list[str]) -> int:
+        fetched = await self.client.get_batch_prices(token_addresses, self.platform)
+        await self._store(fetched)
+        return len(fetched)
+
+    async def _adopt_shared(self, token_addresses: list[str]) -> dict[str, tuple[Optional[float], float]]:
+        """Copy prices from the cache that are newer than the in-process ones."""
+        entries = await self.cache.get_many(self._namespace, token_addresses)
+        shared = {address: (entry[0], float(entry[1])) for address, entry in entries.items()}
+        newer = {
+            address: entry for address, entry in shared.items()
+            if address not in self._prices or entry[1] > self._prices[address][1]
+        }
+        self._prices.update(newer)
+        return shared
+
+    async def _store(self, prices: dict[str, Optional[float]]) -> None:
+        now = time.time()
+        entries = {address.lower(): (price, now) for address, price in prices.items()}
+        self._prices.update(entries)
+        await self.cache.set_many(self._namespace, entries, ttl_seconds=self.ttl_seconds)
@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+from pydantic import ValidationError
+
+from approvalfetcher.model.approval import ApprovalEvents
+from .cache_backend import CacheBackend
+from .pagination import ApprovalSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    LRU cache of /get_approvals scan snapshots keyed by the address set, the scan options and
+    the newest Approval block seen for those addresses on every requested chain.
+
+    Every key also carries a time epoch, so an entry (and its ETags) rolls over once the epoch
+    ends even when no new Approval was mined. Snapshots with prices or balances use the price
+    TTL as epoch, others max_age_seconds, which bounds how long spender classifications and
+    failed lookups stay frozen in a response.
+    Filters and pagination are applied on top of a snapshot, so they only affect the ETag.
+
+    Snapshots are also written to a cache backend shared with other workers, where they expire
+    after ttl_seconds. An in-process backend would only duplicate the LRU, so it is not used.
+    """
+
+    NAMESPACE = "snapshots"
+
+    def __init__(
+        self,
+        max_entries: int,
+        price_ttl_seconds: int,
+        cache: Optional[CacheBackend] = None,
+        ttl_seconds: int = 600,
+        max_age_seconds: int = 600
+    ):
+        self.max_entries = max_entries
+        self.price_ttl_seconds = price_ttl_seconds
+        self.max_age_seconds = max_age_seconds
+        self.shared_cache = cache if cache is not None and cache.shared else None
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, ApprovalSnapshot] = OrderedDict()
+
+    def key(
+        self,
+        addresses: Iterable[str],
+        include_price: bool,
+        last_blocks: dict[str, int],
+        cap_to_balance: bool = False,
+        epoch: Optional[int] = None,
+    ) -> str:
+        """Cache key of a snapshot, in the current epoch unless a pinned one is given."""
+        key = (
+            tuple(sorted({address.lower() for address in addresses})),
+            include_price,
+            tuple(sorted(last_blocks.items())),
+            cap_to_balance,
+            epoch if epoch is not None else self.epoch(include_price, cap_to_balance),
+        )
+        return hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+
+    def epoch(self, include_price: bool, cap_to_balance: bool = False) -> int:
+        epoch_seconds = self.price_ttl_seconds if include_price or cap_to_balance else self.max_age_seconds
+        return int(time.time() // epoch_seconds)
+
+    @staticmethod
+    def etag(key: str, *view: object) -> str:
+        """ETag of a response rendered from the snapshot under key with the given view options."""
+        digest = hashlib.sha256(repr((key, view)).encode()).hexdigest()[:32]
+        return f'"{digest}"'
+
+    @staticmethod
+    def matches(etag: str, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return any(
+            candidate == "*" or candidate.removeprefix("W/") == etag
+            for candidate in candidates
+        )
+
+    async def get(self, key: str) -> Optional[ApprovalSnapshot]:
+        snapshot = self._entries.get(key)
+        if snapshot is not None:
+            self._entries.move_to_end(key)
+            return snapshot
+
+        if self.shared_cache is not None:
+            data = await self.shared_cache.get(self.NAMESPACE, key)
+            if data is not None:
+                try:
+                    snapshot = _load_snapshot(data)
+                except (ValidationError, KeyError, TypeError, ValueError):
+                    logger.warning(f"Ignoring undecodable snapshot {key} in the shared cache")
+                    return None
+                logger.debug(f"Snapshot {key} served from the shared cache")
+                self._remember(key, snapshot)
+        return snapshot
+
+    async def put(self, key: str, snapshot: ApprovalSnapshot) -> None:
+        self._remember(key, snapshot)
+        if self.shared_cache is not None:
+            await self.shared_cache.set(self.NAMESPACE, key, _dump_snapshot(snapshot), ttl_seconds=self.ttl_seconds)
+
+    def _remember(self, key: str, snapshot: ApprovalSnapshot) -> None:
+        self._entries[key] = snapshot
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            logger.debug(f"Evicted cached snapshot {evicted}")
+
+
+def _dump_snapshot(snapshot: ApprovalSnapshot) -> dict[str, Any]:
+    # Tuple keys become rows, as JSON objects only take string keys
+    return {
+        "last_blocks": snapshot.last_blocks,
+        "approval_events_list": [ae.model_dump(mode="json") for ae in snapshot.approval_events_list],
+        "prices": [[*key, price] for key, price in snapshot.prices.items()],
+        "decimals": [[*key, decimals] for key, decimals in snapshot.decimals.items()],
+        "balances": [[*key, balance] for key, balance in snapshot.balances.items()]
+        if snapshot.balances is not None else None,
+    }
+
+
+def _load_snapshot(data: dict[str, Any]) -> ApprovalSnapshot:
+    return ApprovalSnapshot(
+        last_blocks={str(chain): int(block) for chain, block in data["last_blocks"].items()},
+        approval_events_list=[ApprovalEvents.model_validate(ae) for ae in data["approval_events_list"]],
+        prices={(chain, token): price for chain, token, price in data["prices"]},
+        decimals={(chain, token): decimals for chain, token, decimals in data["decimals"]},
+        balances={(chain, owner, token): balance for chain, owner, token, balance in data["balances"]}
+        if data["balances"] is not None else None,
+    )
@@ -0,0 +1,87 @@
+import logging
+from typing import NamedTuple, Optional
+
+from web3 import Web3
+from web3.types import BlockIdentifier
+
+from ..clients.web3_client import Web3Client
+from .cache_backend import CacheBackend, InMemoryCache
+from approvalfetcher.model.approval import SpenderType
+
+logger = logging.getLogger(__name__)
+
+
+class SpenderInfo(NamedTuple):
+    spender_type: SpenderType
+    code_hash: Optional[str]
+
+
+class SpenderService:
+    """
+    Classifies spenders with batched eth_getCode calls.
+
+    Deployed code is immutable, so contracts are cached without a TTL. Addresses without code
+    can still get code deployed later, so they are only cached for a short TTL.
+    """
+
+    def __init__(self, client: Web3Client, eoa_ttl_seconds: int = 600, cache: Optional[CacheBackend] = None):
+        self.client = client
+        self.eoa_ttl_seconds = eoa_ttl_seconds
+        self.cache = cache or InMemoryCache()
+        self._namespace = f"{client.chain.name}:spenders"
+
+    async def classify(self, spender_blocks: dict[str, Optional[int]]) -> dict[str, SpenderInfo]:
+        """
+        Classify spenders, given as spender address -> block of its approval.
+
+        An address without code is checked again at its approval block, code there means the
+        contract was destroyed since.
+        """
+        spenders = {address.lower() for address in spender_blocks}
+        cached = await self.cache.get_many(self._namespace, spenders)
+        classified = {spender: SpenderInfo(SpenderType(info[0]), info[1]) for spender, info in cached.items()}
+        missing = [spender for spender in spenders if spender not in classified]
+
+        if not missing:
+            return classified
+
+        logger.info(f"Classifying {len(missing)} spenders, {len(classified)} served from cache")
+        blocks = {address.lower(): block for address, block in spender_blocks.items()}
+        codes = await self.client.get_codes([(spender, 'latest') for spender in missing])
+
+        contracts: dict[str, SpenderInfo] = {}
+        without_code: list[str] = []
+        for spender, code in zip(missing, codes):
+            if code is None:
+                continue
+            if code:
+                contracts[spender] = self._info(SpenderType.CONTRACT, code)
+            else:
+                without_code.append(spender)
+
+        queries: list[tuple[str, BlockIdentifier]] = [
+            (spender, block) for spender in without_code if (block := blocks.get(spender)) is not None
+        ]
+        past_codes: dict[str, Optional[bytes]] = {}
+        if queries:
+            results = await self.client.get_codes(queries)
+            past_codes = {spender: code for (spender, _), code in zip(queries, results)}
+
+        codeless: dict[str, SpenderInfo] = {}
+        for spender in without_code:
+            past_code = past_codes.get(spender)
+            if spender in past_codes and past_code is None:
+                # The historical lookup failed, the spender stays unknown until the next request
+                continue
+            if past_code:
+                codeless[spender] = self._info(SpenderType.DESTROYED_CONTRACT, past_code)
+            else:
+                codeless[spender] = self._info(SpenderType.EOA, None)
+
+        await self.cache.set_many(self._namespace, contracts)
+        await self.cache.set_many(self._namespace, codeless, ttl_seconds=self.eoa_ttl_seconds)
+        return {**classified, **contracts, **codeless}
+
+    @staticmethod
+    def _info(spender_type: SpenderType, code: Optional[bytes]) -> SpenderInfo:
+        return SpenderInfo(spender_type, Web3.keccak(code).to_0x_hex() if code else None)
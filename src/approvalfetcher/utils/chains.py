@@ -0,0 +1,65 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from approvalfetcher.utils.config import get_settings
+
+DEFAULT_CHAIN = "ethereum"
+
+
+class ChainConfig(BaseModel):
+    name: str = Field(..., description="Chain name used in requests and responses")
+    chain_id: int = Field(..., description="EVM chain id")
+    rpc_endpoint: str = Field(..., description="RPC endpoint")
+    append_api_key: bool = Field(default=True, description="Whether the Infura API key is appended to the endpoint")
+    coingecko_platform: str = Field(..., description="CoinGecko asset platform id")
+    max_block_range: Optional[int] = Field(default=None, description="Maximum blocks per eth_getLogs call, None for unlimited")
+    start_block: int = Field(default=0, description="First block scanned for Approval logs")
+
+
+# Block ranges keep a full-history scan at roughly a hundred eth_getLogs calls per chain. Providers
+# with stricter caps are configured through CHAIN_MAX_BLOCK_RANGES. Arbitrum and Optimism start at
+# their Nitro and Bedrock genesis blocks, older history is only served by legacy nodes, so approvals
+# from before the upgrade are missed unless CHAIN_START_BLOCKS points them at an endpoint that has it.
+CHAINS: dict[str, ChainConfig] = {
+    chain.name: chain
+    for chain in [
+        ChainConfig(name="ethereum", chain_id=1, rpc_endpoint="https://mainnet.infura.io/v3/",
+                    coingecko_platform="ethereum"),
+        ChainConfig(name="arbitrum", chain_id=42161, rpc_endpoint="https://arbitrum-mainnet.infura.io/v3/",
+                    coingecko_platform="arbitrum-one", max_block_range=5_000_000, start_block=22_207_817),
+        ChainConfig(name="optimism", chain_id=10, rpc_endpoint="https://optimism-mainnet.infura.io/v3/",
+                    coingecko_platform="optimistic-ethereum", max_block_range=2_000_000, start_block=105_235_063),
+        ChainConfig(name="base", chain_id=8453, rpc_endpoint="https://base-mainnet.infura.io/v3/",
+                    coingecko_platform="base", max_block_range=2_000_000),
+        ChainConfig(name="polygon", chain_id=137, rpc_endpoint="https://polygon-mainnet.infura.io/v3/",
+                    coingecko_platform="polygon-pos", max_block_range=1_000_000),
+        ChainConfig(name="linea", chain_id=59144, rpc_endpoint="https://linea-mainnet.infura.io/v3/",
+                    coingecko_platform="linea", max_block_range=1_000_000),
+        ChainConfig(name="avalanche", chain_id=43114, rpc_endpoint="https://avalanche-mainnet.infura.io/v3/",
+                    coingecko_platform="avalanche", max_block_range=1_000_000),
+        ChainConfig(name="bsc", chain_id=56, rpc_endpoint="https://bsc-mainnet.infura.io/v3/",
+                    coingecko_platform="binance-smart-chain", max_block_range=1_000_000),
+    ]
+}
+
+
+def get_chain(name: str) -> ChainConfig:
+    """Chain config with the RPC endpoint, block range and start block overrides from settings applied."""
+    chain = CHAINS.get(name)
+    if chain is None:
+        raise ValueError(f"Unsupported chain: {name}")
+
+    settings = get_settings()
+    overrides: dict[str, object] = {}
+    if name == DEFAULT_CHAIN:
+        overrides["rpc_endpoint"] = settings.infura_endpoint
+    if name in settings.chain_rpc_endpoints:
+        overrides["rpc_endpoint"] = settings.chain_rpc_endpoints[name]
+        overrides["append_api_key"] = False
+    if name in settings.chain_max_block_ranges:
+        overrides["max_block_range"] = settings.chain_max_block_ranges[name]
+    if name in settings.chain_start_blocks:
+        overrides["start_block"] = settings.chain_start_blocks[name]
+
+    return chain.model_copy(update=overrides)
@@ -18,3 +18,52 @@ def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
     )
 
     return parser.parse_args(args)
+
+
+def _address_set_sizes(value: str) -> dict[int, float]:
+    try:
+        sizes = {int(size): float(share) for size, share in (item.split(":") for item in value.split(","))}
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected size:share pairs like 1:0.7,5:0.3, got {value}")
+    if not sizes or any(size < 1 or share <= 0 for size, share in sizes.items()):
+        raise argparse.ArgumentTypeError("Sizes must be at least 1 and shares positive")
+    return sizes
+
+
+def parse_loadtest_args(args: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="approval-fetcher-loadtest",
+        description="Drive the approvals API with open-loop traffic against local fake RPC and CoinGecko servers",
+        epilog="Example: approval-fetcher-loadtest --rps 50 --duration 60 --workers 4 --rpc-latency-ms 80",
+    )
+
+    traffic = parser.add_argument_group("traffic")
+    traffic.add_argument("--rps", type=float, default=20.0, help="Target request arrival rate")
+    traffic.add_argument("--duration", type=float, default=30.0, help="Traffic window in seconds")
+    traffic.add_argument("--address-set-sizes", type=_address_set_sizes, default="1:0.7,5:0.2,25:0.08,100:0.02",
+                         help="Address set size to share of requests, e.g. 1:0.7,5:0.3")
+    traffic.add_argument("--repeat-rate", type=float, default=0.8,
+                         help="Share of requests repeating an earlier address set")
+    traffic.add_argument("--query", default="", help="Query string appended to /get_approvals, e.g. limit=100")
+    traffic.add_argument("--seed", type=int, default=0, help="Seed for arrivals, address sets and fake data")
+
+    server = parser.add_argument_group("server")
+    server.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    server.add_argument("--port", type=int, default=8765, help="Port of the server under test")
+    server.add_argument("--cache-backend", choices=["memory", "sqlite"], default="memory",
+                        help="Cache backend of the server, sqlite is shared by its workers")
+
+    for name, latency in (("rpc", 50.0), ("coingecko", 150.0)):
+        upstream = parser.add_argument_group(f"fake {name}")
+        upstream.add_argument(f"--{name}-latency-ms", type=float, default=latency, help="Mean response latency")
+        upstream.add_argument(f"--{name}-jitter-ms", type=float, default=latency / 5, help="Uniform latency jitter")
+        upstream.add_argument(f"--{name}-rate-limit", type=float, default=None,
+                              help="Requests per second before answering 429")
+        upstream.add_argument(f"--{name}-error-rate", type=float, default=0.0,
+                              help="Share of requests answered with 500")
+
+    parser.add_argument("--block-time", type=float, default=None,
+                        help="Advance the fake chain head every N seconds (default: static head)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    return parser.parse_args(args)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
@@ -12,10 +13,39 @@ class Settings(BaseSettings):
     infura_api_key: str = Field(default="", min_length=1)
     infura_endpoint: str = "https://mainnet.infura.io/v3/"
 
+    enabled_chains: list[str] = Field(default=["ethereum"], description="Chains the server connects to")
+    chain_rpc_endpoints: dict[str, str] = Field(default_factory=dict, description="Per-chain RPC endpoint overrides")
+    chain_max_block_ranges: dict[str, int] = Field(default_factory=dict, description="Per-chain eth_getLogs block range limits")
+    chain_start_blocks: dict[str, int] = Field(default_factory=dict, description="Per-chain first block scanned for approvals")
+    max_log_chunks: int = Field(default=1000, description="Maximum eth_getLogs calls a single range query is split into")
+
     coingecko_base_url: str = "https://api.coingecko.com/api/v3"
     coingecko_api_key: str = Field(default="")
 
     max_concurrent_tasks: int = Field(default=2, description="Maximum concurrent API tasks")
+    max_concurrent_rpc_calls: int = Field(default=10, description="Maximum concurrent token contract calls")
+    rpc_batch_size: int = Field(default=100, description="Requests per JSON-RPC batch")
+    scan_state_ttl_seconds: int = Field(default=86400, description="How long the scan state of an owner is kept after its last request")
+    eoa_cache_ttl_seconds: int = Field(default=600, description="How long an address without code stays classified")
+
+    price_cache_ttl_seconds: int = Field(default=300, description="How long a fetched token price stays fresh")
+    price_max_stale_seconds: int = Field(default=900, description="Oldest price served for a hot token")
+    price_refresh_interval_seconds: int = Field(default=60, description="Interval between background price refreshes")
+    price_refresh_top_n: int = Field(default=100, description="Number of most requested tokens kept warm")
+    price_refresh_batch_size: int = Field(default=50, description="Token addresses per CoinGecko batch call")
+    price_refresh_max_calls_per_minute: int = Field(default=10, description="CoinGecko calls the refreshers may spend per minute, shared by all workers on the cache backend")
+
+    max_page_size: int = Field(default=1000, description="Maximum approvals per /get_approvals page")
+
+    response_cache_max_entries: int = Field(default=256, description="Maximum cached /get_approvals responses")
+    response_cache_price_ttl_seconds: int = Field(default=60, description="How long a priced response stays valid")
+    response_cache_ttl_seconds: int = Field(default=600, description="How long a response stays in the shared cache")
+
+    cache_backend: Literal["memory", "sqlite"] = Field(default="memory", description="Cache shared by the services")
+    cache_sqlite_path: str = Field(
+        default=str(Path.home() / ".cache" / "approvalfetcher" / "cache.sqlite3"),
+        description="Database file of the sqlite cache, shared by every worker on the host",
+    )
 
     log_level: str = "INFO"
 
@@ -1,9 +1,18 @@
 APPROVAL_EVENT_SIGNATURE = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
 
-COINGECKO_TOKEN_BY_CONTRACT_PATH = "/coins/ethereum/contract/{address}"
+COINGECKO_TOKEN_BY_CONTRACT_PATH = "/coins/{platform}/contract/{address}"
+
+COINGECKO_TOKEN_PRICE_PATH = "/simple/token_price/{platform}"
+
+COINGECKO_DEFAULT_PLATFORM = "ethereum"
 
 TOKEN_PRICE_CURRENCY = "usd"
 
+UNKNOWN_TOKEN_SYMBOL = "UnknownERC20"
+
+# Blocks below the head treated as final on chains without a "finalized" block tag
+FINALITY_FALLBACK_DEPTH = 128
+
 ERC20_ABI = [
     {
         "constant": True,
@@ -18,5 +27,19 @@ ERC20_ABI = [
         "name": "name",
         "outputs": [{"name": "", "type": "string"}],
         "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [{"name": "owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "type": "function"
     }
 ]
@@ -0,0 +1,64 @@
+from decimal import Decimal, localcontext
+from typing import NamedTuple, Optional, Sequence
+
+from approvalfetcher.utils.formatters import THRESHOLD
+
+# uint256 amounts have up to 78 digits, keep Decimal math exact for all of them
+DECIMAL_PRECISION = 80
+
+
+class Exposure(NamedTuple):
+    amount: Optional[Decimal]
+    exposure_usd: Optional[float]
+    is_unlimited: bool
+
+
+def compute_exposures(
+    values: Sequence[int],
+    decimals: Sequence[Optional[int]],
+    prices: Sequence[Optional[float]],
+    balances: Optional[Sequence[Optional[int]]] = None,
+) -> list[Exposure]:
+    """
+    Compute human amounts and USD exposure for a whole result set in one pass.
+
+    The inputs are parallel columns, one row per approval. An approval above 2**255 is
+    treated as unlimited: it has no human amount, and its exposure is only known when it
+    is capped by the owner's balance.
+    """
+    balance_column = balances if balances is not None else [None] * len(values)
+
+    exposures: list[Exposure] = []
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        for value, token_decimals, price, balance in zip(values, decimals, prices, balance_column):
+            is_unlimited = value > THRESHOLD
+
+            if token_decimals is None:
+                exposures.append(Exposure(None, None, is_unlimited))
+                continue
+
+            amount = None if is_unlimited else Decimal(value).scaleb(-token_decimals)
+
+            exposed = value if balance is None else min(value, balance)
+            if price is None or (is_unlimited and balance is None):
+                exposure_usd = None
+            else:
+                exposure_usd = float(Decimal(exposed).scaleb(-token_decimals) * Decimal(str(price)))
+
+            exposures.append(Exposure(amount, exposure_usd, is_unlimited))
+
+    return exposures
+
+
+def exposure_rank(exposure: Exposure) -> float:
+    """Sort key for risk ranking: uncapped unlimited approvals first, unknown exposure last."""
+    if exposure.exposure_usd is not None:
+        return exposure.exposure_usd
+    return float("inf") if exposure.is_unlimited else -1.0
+
+
+def format_decimal(amount: Decimal) -> str:
+    with localcontext() as ctx:
+        ctx.prec = DECIMAL_PRECISION
+        return format(amount.normalize(), "f")
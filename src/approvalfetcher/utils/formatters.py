@@ -13,7 +13,10 @@ def normalize_approval_amount(data: str) -> str:
 
 
 def parse_amount(log_data: HexBytes) -> str:
-    amount = int(log_data.hex(), 16)
+    return format_amount(int(log_data.hex(), 16))
+
+
+def format_amount(amount: int) -> str:
     if amount > THRESHOLD:
         return "INFINITY"
     return str(amount)
@@ -25,6 +28,6 @@ def format_approval_text(approval_events: ApprovalEvents) -> str:
     lines = []
     for event in approval_events.events:
         token_display = event.token_symbol or "UnknownERC20"
-        amount: str = parse_amount(HexBytes(event.value))
+        amount: str = format_amount(int(event.value, 0))
         lines.append(f"approval on {token_display} to {event.spender} on amount of {amount}")
     return "\n".join(lines)
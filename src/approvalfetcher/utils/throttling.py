@@ -1,4 +1,4 @@
-from typing import TypeVar, Callable, List, Awaitable
+from typing import TypeVar, Callable, Iterable, List, Awaitable
 import asyncio
 
 TIn = TypeVar("TIn")   # input type
@@ -11,7 +11,7 @@ class Throttling:
 
     async def submit(
         self,
-        items: set[TIn],
+        items: Iterable[TIn],
         func: Callable[[TIn], Awaitable[TOut]]
     ) -> List[TOut]:
         async def worker(item: TIn) -> TOut:
@@ -0,0 +1,11 @@
+import pytest
+
+from approvalfetcher.utils.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def settings_env(monkeypatch):
+    monkeypatch.setenv("INFURA_API_KEY", "test")
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
@@ -0,0 +1,156 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents
+from approvalfetcher.services.chain_registry import ChainRegistry, ChainScan
+from approvalfetcher.services.pagination import decode_cursor, encode_cursor
+from approvalfetcher.services.response_cache import ResponseCache
+from approvalfetcher.utils.chains import get_chain
+
+OWNER = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+USDT = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+SPENDER = "0x000000000022d473030f116ddee9f6b43ac78ba3"
+
+
+def chain_scan(chain: str, last_approval_block: int) -> ChainScan:
+    events = ApprovalEvents(
+        address=OWNER, chain=chain, total_events=2, scanned_blocks=1001, last_approval_block=last_approval_block,
+        events=[
+            ApprovalEvent(token_address=USDT, spender=SPENDER, value=str(10 ** 6), block_number=800, log_index=0),
+            ApprovalEvent(token_address=USDC, spender=SPENDER, value=str(2 * 10 ** 6), block_number=900, log_index=0),
+        ],
+    )
+    return ChainScan(
+        [events],
+        {(chain, USDT): 1.0, (chain, USDC): 1.0},
+        {(chain, USDT): 6, (chain, USDC): 6},
+        None,
+    )
+
+
+def chain_services(mocker, name: str, last_approval_block: int):
+    services = mocker.Mock()
+    services.chain = get_chain(name)
+    services.approval_service.probe_last_approval_block = mocker.AsyncMock(return_value=last_approval_block)
+    services.scan = mocker.AsyncMock(return_value=chain_scan(name, last_approval_block))
+    return services
+
+
+@pytest.fixture
+def ethereum(mocker):
+    return chain_services(mocker, "ethereum", 900)
+
+
+@pytest.fixture
+def client(ethereum, mocker):
+    # The routes module reads settings on import, after conftest has set the API key
+    from approvalfetcher.routes.approval import router
+
+    registry = ChainRegistry()
+    registry.register(ethereum)
+    registry.register(chain_services(mocker, "base", 500))
+
+    app = FastAPI()
+    app.include_router(router)
+    app.state.chain_registry = registry
+    app.state.response_cache = ResponseCache(max_entries=16, price_ttl_seconds=60)
+    return TestClient(app)
+
+
+def test_snapshot_is_keyed_by_the_blocks_the_scan_saw(client, ethereum):
+    # Another request moves the shared scan state past what this scan covered
+    ethereum.approval_service.probe_last_approval_block.side_effect = [None, 950]
+
+    first = client.post("/get_approvals", params={"limit": 1}, json=[OWNER])
+
+    assert first.status_code == 200
+    assert decode_cursor(first.json()["next_cursor"]).snapshot == {"ethereum": 900}
+
+
+def test_if_none_match_returns_not_modified(client, ethereum):
+    first = client.post("/get_approvals", json=[OWNER])
+    etag = first.headers["ETag"]
+
+    second = client.post("/get_approvals", json=[OWNER], headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    ethereum.scan.assert_awaited_once()
+
+
+def test_new_approval_block_changes_etag(client, ethereum):
+    first = client.post("/get_approvals", json=[OWNER])
+
+    ethereum.approval_service.probe_last_approval_block.return_value = 950
+    ethereum.scan.return_value = chain_scan("ethereum", 950)
+    second = client.post("/get_approvals", json=[OWNER], headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert ethereum.scan.await_count == 2
+
+
+def test_next_page_is_served_from_the_pinned_snapshot(client, ethereum):
+    first = client.post("/get_approvals", params={"limit": 1}, json=[OWNER])
+    second = client.post("/get_approvals", params={"limit": 1, "cursor": first.json()["next_cursor"]}, json=[OWNER])
+
+    assert second.status_code == 200
+    assert [event["block_number"] for event in second.json()["events"]] == [900]
+    assert second.json()["next_cursor"] is None
+    ethereum.scan.assert_awaited_once()
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.post("/get_approvals", params={"cursor": "not-a-cursor"}, json=[OWNER])
+
+    assert response.status_code == 400
+
+
+def test_cursor_of_another_query_is_rejected(client):
+    first = client.post("/get_approvals", params={"limit": 1}, json=[OWNER])
+    response = client.post(
+        "/get_approvals",
+        params={"limit": 1, "min_value": 1, "cursor": first.json()["next_cursor"]},
+        json=[OWNER],
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor does not match this query"
+
+
+def test_cursor_position_not_matching_the_sort_key_is_rejected(client):
+    first = client.post("/get_approvals", params={"limit": 1}, json=[OWNER])
+    cursor = decode_cursor(first.json()["next_cursor"])
+    forged = encode_cursor(cursor._replace(position=("ethereum", OWNER, "800", 0)))
+
+    response = client.post("/get_approvals", params={"limit": 1, "cursor": forged}, json=[OWNER])
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_expired_exposure_sorted_snapshot_is_gone(client):
+    params = {"limit": 1, "sort_by_exposure": True}
+    first = client.post("/get_approvals", params=params, json=[OWNER])
+    client.app.state.response_cache._entries.clear()
+
+    response = client.post("/get_approvals", params={**params, "cursor": first.json()["next_cursor"]}, json=[OWNER])
+
+    assert response.status_code == 410
+
+
+def test_chains_are_scanned_and_merged(client, ethereum):
+    response = client.post("/get_approvals", params={"chains": ["base", "ethereum", "base"]}, json=[OWNER])
+
+    assert response.status_code == 200
+    assert sorted(event["chain"] for event in response.json()["events"]) == ["base", "base", "ethereum", "ethereum"]
+    assert client.app.state.chain_registry.get("base").scan.await_count == 1
+    ethereum.scan.assert_awaited_once()
+
+
+def test_disabled_chain_is_rejected(client):
+    response = client.post("/get_approvals", params={"chains": "polygon"}, json=[OWNER])
+
+    assert response.status_code == 400
@@ -1,3 +1,7 @@
+import time
+
+from hexbytes import HexBytes
+
 from approvalfetcher.model.approval import ApprovalEvent
 from approvalfetcher.services.approval_service import ApprovalService
 
@@ -90,3 +94,47 @@ def test_filter_latest_approvals_case_insensitive():
 def test_filter_latest_approvals_empty_list():
     filtered = ApprovalService._filter_latest_approvals([])
     assert len(filtered) == 0
+
+
+async def test_probe_last_approval_block_scans_only_new_blocks(mocker):
+    owner = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+    client = mocker.Mock()
+    client.get_latest_block = mocker.AsyncMock(return_value=1200)
+    client.get_approval_logs = mocker.AsyncMock(return_value=[
+        {'topics': [HexBytes("0x8c5b"), HexBytes("0x" + "0" * 24 + owner[2:])], 'blockNumber': 1150},
+    ])
+
+    service = ApprovalService(client)
+    assert await service.probe_last_approval_block([owner]) is None
+
+    await service._record_scans({owner: (1000, 900)})
+    assert await service.probe_last_approval_block([owner.upper().replace("0X", "0x")]) == 1150
+    client.get_approval_logs.assert_awaited_once_with([owner], 1001, 1200)
+
+
+async def test_failed_decimals_lookups_are_not_cached(mocker):
+    token = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+    client = mocker.Mock()
+    client.get_multiple_token_decimals = mocker.AsyncMock(side_effect=[[None], [6], [18]])
+    service = ApprovalService(client)
+
+    assert await service.fetch_token_decimals([token]) == {token: None}
+    assert await service.fetch_token_decimals([token]) == {token: 6}
+    assert await service.fetch_token_decimals([token]) == {token: 6}
+    assert client.get_multiple_token_decimals.await_count == 2
+
+
+async def test_scan_state_expires(monkeypatch, mocker):
+    monkeypatch.setenv("SCAN_STATE_TTL_SECONDS", "60")
+    owner = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+    client = mocker.Mock()
+    client.chain.name = "ethereum"
+    client.get_latest_block = mocker.AsyncMock(return_value=1000)
+    client.get_approval_logs = mocker.AsyncMock(return_value=[])
+    service = ApprovalService(client)
+
+    await service._record_scans({owner: (1000, 900)})
+    assert await service.probe_last_approval_block([owner]) == 900
+
+    mocker.patch("approvalfetcher.services.cache_backend.time.time", return_value=time.time() + 61)
+    assert await service.probe_last_approval_block([owner]) is None
@@ -0,0 +1,36 @@
+from approvalfetcher.services.block_service import BlockHeaderResolver
+
+
+async def test_resolve_timestamps_deduplicates_blocks(mocker):
+    client = mocker.Mock()
+    client.get_finalized_block_number = mocker.AsyncMock(return_value=1000)
+    client.get_block_timestamps = mocker.AsyncMock(side_effect=lambda blocks: [block * 10 for block in blocks])
+    resolver = BlockHeaderResolver(client)
+
+    timestamps = await resolver.resolve_timestamps([5, 7, 5, 7, 5])
+
+    assert timestamps == {5: 50, 7: 70}
+    client.get_block_timestamps.assert_awaited_once_with([5, 7])
+
+
+async def test_only_finalized_headers_are_cached(mocker):
+    client = mocker.Mock()
+    client.get_finalized_block_number = mocker.AsyncMock(return_value=100)
+    client.get_block_timestamps = mocker.AsyncMock(side_effect=lambda blocks: [block * 10 for block in blocks])
+    resolver = BlockHeaderResolver(client)
+
+    await resolver.resolve_timestamps([50, 150])
+    client.get_block_timestamps.reset_mock()
+    timestamps = await resolver.resolve_timestamps([50, 150])
+
+    assert timestamps == {50: 500, 150: 1500}
+    client.get_block_timestamps.assert_awaited_once_with([150])
+
+
+async def test_failed_headers_are_skipped(mocker):
+    client = mocker.Mock()
+    client.get_finalized_block_number = mocker.AsyncMock(return_value=100)
+    client.get_block_timestamps = mocker.AsyncMock(return_value=[None])
+    resolver = BlockHeaderResolver(client)
+
+    assert await resolver.resolve_timestamps([1]) == {}
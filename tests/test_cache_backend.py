@@ -0,0 +1,165 @@
+import time
+
+import pytest
+
+from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents, SpenderType
+from approvalfetcher.services.approval_service import ApprovalService
+from approvalfetcher.services.cache_backend import InMemoryCache, SqliteCache, create_cache_backend
+from approvalfetcher.services.pagination import ApprovalSnapshot
+from approvalfetcher.services.price_service import PriceService
+from approvalfetcher.services.response_cache import ResponseCache
+
+USDT = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+async def test_in_memory_cache_expires_entries(mocker):
+    cache = InMemoryCache()
+    await cache.set_many("prices", {USDT: 1.0, USDC: None}, ttl_seconds=10)
+    await cache.set("decimals", USDT, 6)
+
+    assert await cache.get_many("prices", [USDT, USDC, "other"]) == {USDT: 1.0, USDC: None}
+
+    mocker.patch("approvalfetcher.services.cache_backend.time.time", return_value=time.time() + 11)
+    assert await cache.get_many("prices", [USDT, USDC]) == {}
+    assert await cache.get("decimals", USDT) == 6
+
+
+async def test_sqlite_cache_is_shared_between_connections(sqlite_path):
+    async with SqliteCache(sqlite_path) as writer, SqliteCache(sqlite_path) as reader:
+        await writer.set_many("ethereum:decimals", {USDT: 6, USDC: None})
+        await writer.set("ethereum:spenders", USDT, ("contract", "0x01"))
+
+        assert await reader.get_many("ethereum:decimals", [USDT, USDC, "other"]) == {USDT: 6, USDC: None}
+        assert await reader.get("ethereum:spenders", USDT) == ["contract", "0x01"]
+        assert await reader.get_many("base:decimals", [USDT]) == {}
+
+
+async def test_sqlite_cache_expires_and_purges_entries(sqlite_path, mocker):
+    async with SqliteCache(sqlite_path, purge_interval_seconds=0) as cache:
+        await cache.set("prices", USDT, 1.0, ttl_seconds=10)
+        await cache.set("decimals", USDT, 6)
+
+        mocker.patch("approvalfetcher.services.cache_backend.time.time", return_value=time.time() + 11)
+        assert await cache.get("prices", USDT) is None
+
+        await cache.set("decimals", USDC, 6)
+        assert cache._require_connection().execute("SELECT COUNT(*) FROM cache").fetchone() == (2,)
+
+
+async def test_sqlite_cache_requires_open_connection(sqlite_path):
+    with pytest.raises(RuntimeError):
+        await SqliteCache(sqlite_path).get("prices", USDT)
+
+
+def test_create_cache_backend():
+    assert isinstance(create_cache_backend("memory", ""), InMemoryCache)
+    with pytest.raises(ValueError):
+        create_cache_backend("redis", "")
+
+
+async def test_price_fetched_by_one_worker_warms_another(sqlite_path, mocker):
+    async with SqliteCache(sqlite_path) as first_cache, SqliteCache(sqlite_path) as second_cache:
+        client = mocker.Mock()
+        client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0})
+        first = PriceService(client, ttl_seconds=300, cache=first_cache)
+        second = PriceService(client, ttl_seconds=300, cache=second_cache)
+
+        assert await first.fetch_prices([USDT]) == {USDT: 1.0}
+        assert await second.fetch_prices([USDT]) == {USDT: 1.0}
+        assert await second.expiring([USDT], within_seconds=60) == []
+        client.get_multiple_prices.assert_awaited_once()
+
+
+async def test_scan_state_and_metadata_are_shared(sqlite_path, mocker):
+    owner = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+    async with SqliteCache(sqlite_path) as first_cache, SqliteCache(sqlite_path) as second_cache:
+        client = mocker.Mock()
+        client.chain.name = "ethereum"
+        client.get_latest_block = mocker.AsyncMock(return_value=1000)
+        client.get_multiple_token_decimals = mocker.AsyncMock(return_value=[6])
+        client.get_token_symbol = mocker.AsyncMock(side_effect=["USDT", "UnknownERC20"])
+        first = ApprovalService(client, first_cache)
+        second = ApprovalService(client, second_cache)
+
+        await first._record_scans({owner: (1000, 900)})
+        await first.fetch_token_decimals([USDT])
+        await first.fetch_token_symbols([USDT, USDC])
+
+        assert await second.probe_last_approval_block([owner]) == 900
+        assert await second.fetch_token_decimals([USDT.upper().replace("0X", "0x")]) == {USDT: 6}
+        assert await second_cache.get_many("ethereum:symbols", [USDT, USDC]) == {USDT: "USDT"}
+        client.get_multiple_token_decimals.assert_awaited_once()
+
+
+async def test_response_cache_reads_snapshots_of_other_workers(sqlite_path):
+    snapshot = ApprovalSnapshot(last_blocks={"ethereum": 1}, approval_events_list=[], prices={}, decimals={},
+                                balances=None)
+    async with SqliteCache(sqlite_path) as first_cache, SqliteCache(sqlite_path) as second_cache:
+        first = ResponseCache(max_entries=4, price_ttl_seconds=60, cache=first_cache)
+        second = ResponseCache(max_entries=4, price_ttl_seconds=60, cache=second_cache)
+
+        await first.put("key", snapshot)
+
+        assert await second.get("key") == snapshot
+        assert ResponseCache(max_entries=4, price_ttl_seconds=60, cache=InMemoryCache()).shared_cache is None
+
+
+async def test_failed_decimals_lookup_is_not_shared(sqlite_path, mocker):
+    async with SqliteCache(sqlite_path) as cache:
+        client = mocker.Mock()
+        client.chain.name = "ethereum"
+        client.get_multiple_token_decimals = mocker.AsyncMock(return_value=[None])
+
+        assert await ApprovalService(client, cache).fetch_token_decimals([USDT]) == {USDT: None}
+        assert await cache.get_many("ethereum:decimals", [USDT]) == {}
+
+
+async def test_sqlite_cache_ignores_undecodable_rows(sqlite_path):
+    async with SqliteCache(sqlite_path) as cache:
+        await cache.set("ethereum:decimals", USDC, 6)
+        cache._require_connection().execute(
+            "INSERT INTO cache VALUES (?, ?, ?, NULL)", ("ethereum:decimals", USDT, b"\x80\x04N.")
+        )
+
+        assert await cache.get_many("ethereum:decimals", [USDT, USDC]) == {USDC: 6}
+
+
+async def test_sqlite_cache_file_is_private(tmp_path):
+    path = tmp_path / "cache" / "cache.sqlite3"
+    async with SqliteCache(str(path)):
+        pass
+
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+async def test_snapshot_with_events_survives_the_shared_cache(sqlite_path):
+    events = ApprovalEvents(address=USDT, chain="base", total_events=1, scanned_blocks=10, events=[
+        ApprovalEvent(token_address=USDC, spender=USDT, value="1", block_number=5, spender_type=SpenderType.EOA),
+    ])
+    snapshot = ApprovalSnapshot(last_blocks={"base": 5}, approval_events_list=[events],
+                                prices={("base", USDC): 1.0}, decimals={("base", USDC): 6},
+                                balances={("base", USDT, USDC): 10})
+    async with SqliteCache(sqlite_path) as first_cache, SqliteCache(sqlite_path) as second_cache:
+        await ResponseCache(max_entries=4, price_ttl_seconds=60, cache=first_cache).put("key", snapshot)
+        await second_cache.set(ResponseCache.NAMESPACE, "broken", {"last_blocks": {}})
+
+        second = ResponseCache(max_entries=4, price_ttl_seconds=60, cache=second_cache)
+        assert await second.get("key") == snapshot
+        assert await second.get("broken") is None
+
+
+async def test_in_memory_cache_purges_expired_entries_on_write(mocker):
+    cache = InMemoryCache(purge_interval_seconds=0)
+    await cache.set_many("ethereum:scans", {USDT: [1, 1], USDC: [1, 1]}, ttl_seconds=10)
+
+    mocker.patch("approvalfetcher.services.cache_backend.time.time", return_value=time.time() + 11)
+    await cache.set("ethereum:scans", "other", [2, 2], ttl_seconds=10)
+
+    assert list(cache._entries) == [("ethereum:scans", "other")]
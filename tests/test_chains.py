@@ -0,0 +1,95 @@
+import pytest
+
+from approvalfetcher.clients.web3_client import Web3Client
+from approvalfetcher.utils.chains import get_chain
+
+
+def test_get_chain_unknown():
+    with pytest.raises(ValueError):
+        get_chain("not-a-chain")
+
+
+def test_get_chain_applies_overrides(monkeypatch):
+    monkeypatch.setenv("CHAIN_RPC_ENDPOINTS", '{"base": "http://localhost:8545"}')
+    monkeypatch.setenv("CHAIN_MAX_BLOCK_RANGES", '{"base": 5000}')
+
+    chain = get_chain("base")
+
+    assert chain.rpc_endpoint == "http://localhost:8545"
+    assert not chain.append_api_key
+    assert chain.max_block_range == 5000
+    assert chain.coingecko_platform == "base"
+    assert Web3Client(chain).endpoint == "http://localhost:8545"
+
+
+async def test_get_logs_in_ranges_splits_by_max_block_range(mocker):
+    client = Web3Client(get_chain("ethereum").model_copy(update={"max_block_range": 100}))
+    get_logs = mocker.patch.object(client, "_get_logs", mocker.AsyncMock(return_value=[{"blockNumber": 1}]))
+
+    logs = await client._get_logs_in_ranges(0, 250, ["0x"])
+
+    assert len(logs) == 3
+    assert sorted(call.args[:2] for call in get_logs.await_args_list) == [(0, 99), (100, 199), (200, 250)]
+
+
+async def test_get_all_approval_logs_starts_at_chain_start_block(mocker):
+    client = Web3Client(get_chain("arbitrum"))
+    get_logs = mocker.patch.object(client, "_get_logs", mocker.AsyncMock(return_value=[]))
+
+    await client.get_all_approval_logs("0x1111111254fb6c44bac0bed2854e76f90643097d", 30_000_000)
+
+    assert sorted(call.args[:2] for call in get_logs.await_args_list) == [
+        (22_207_817, 27_207_816), (27_207_817, 30_000_000)
+    ]
+
+
+async def test_get_logs_in_ranges_bounds_chunk_count(monkeypatch, mocker):
+    monkeypatch.setenv("MAX_LOG_CHUNKS", "2")
+    client = Web3Client(get_chain("ethereum").model_copy(update={"max_block_range": 100}))
+    get_logs = mocker.patch.object(client, "_get_logs", mocker.AsyncMock(return_value=[]))
+
+    with pytest.raises(ValueError):
+        await client._get_logs_in_ranges(0, 250, ["0x"])
+    get_logs.assert_not_awaited()
+
+
+async def test_get_all_approval_logs_before_start_block_is_empty(monkeypatch, mocker):
+    monkeypatch.setenv("CHAIN_START_BLOCKS", '{"optimism": 1000}')
+    client = Web3Client(get_chain("optimism"))
+    get_logs = mocker.patch.object(client, "_get_logs", mocker.AsyncMock(return_value=[]))
+
+    assert client.chain.start_block == 1000
+    assert await client.get_all_approval_logs("0x1111111254fb6c44bac0bed2854e76f90643097d", 999) == []
+    get_logs.assert_not_awaited()
+
+
+async def test_execute_batched_isolates_failing_requests(mocker):
+    client = Web3Client(get_chain("ethereum"))
+    sent: list[list[str]] = []
+
+    class FakeBatch:
+        def __init__(self):
+            self.requests: list[str] = []
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            return None
+
+        def add(self, request):
+            self.requests.append(request)
+
+        async def async_execute(self):
+            sent.append(self.requests)
+            if "bad" in self.requests:
+                raise ValueError("execution reverted")
+            return [request.upper() for request in self.requests]
+
+    mocker.patch.object(client.w3, "batch_requests", FakeBatch)
+
+    results = await client._execute_batched(["a", "b", "bad", "c"], lambda item: item, "test", isolate_failures=True)
+
+    assert results == ["A", "B", None, "C"]
+    assert sent == [["a", "b", "bad", "c"], ["a", "b"], ["bad", "c"], ["bad"], ["c"]]
+    assert await client._execute_batched(["a", "bad"], lambda item: item, "test") == [None, None]
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+from approvalfetcher.dto.approval.approval_response import to_response
+from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents
+from approvalfetcher.utils.exposure import Exposure, compute_exposures, exposure_rank, format_decimal
+
+UNLIMITED = 2 ** 256 - 1
+
+
+def test_compute_exposures_scales_by_decimals():
+    [exposure] = compute_exposures(values=[2_500_000], decimals=[6], prices=[2.0])
+
+    assert exposure.amount == Decimal("2.5")
+    assert exposure.exposure_usd == 5.0
+    assert not exposure.is_unlimited
+
+
+def test_compute_exposures_caps_at_balance():
+    [exposure] = compute_exposures(values=[10 ** 20], decimals=[18], prices=[3.0], balances=[10 ** 18])
+
+    assert exposure.amount == Decimal(100)
+    assert exposure.exposure_usd == 3.0
+
+
+def test_compute_exposures_unlimited():
+    uncapped, capped = compute_exposures(
+        values=[UNLIMITED, UNLIMITED], decimals=[18, 18], prices=[1.0, 1.0], balances=[None, 5 * 10 ** 18]
+    )
+
+    assert uncapped == Exposure(amount=None, exposure_usd=None, is_unlimited=True)
+    assert capped == Exposure(amount=None, exposure_usd=5.0, is_unlimited=True)
+
+
+def test_compute_exposures_unknown_decimals_or_price():
+    no_decimals, no_price = compute_exposures(values=[100, 100], decimals=[None, 2], prices=[1.0, None])
+
+    assert no_decimals == Exposure(amount=None, exposure_usd=None, is_unlimited=False)
+    assert no_price == Exposure(amount=Decimal(1), exposure_usd=None, is_unlimited=False)
+
+
+def test_exposure_rank_orders_unlimited_first_and_unknown_last():
+    exposures = [
+        Exposure(None, None, False),
+        Exposure(Decimal(1), 10.0, False),
+        Exposure(None, None, True),
+    ]
+
+    ranked = sorted(exposures, key=exposure_rank, reverse=True)
+
+    assert [e.is_unlimited for e in ranked] == [True, False, False]
+    assert ranked[1].exposure_usd == 10.0
+
+
+def test_format_decimal_keeps_full_precision():
+    assert format_decimal(Decimal("10000000000000000000000.000000000000000001000")) == "10000000000000000000000.000000000000000001"
+    assert format_decimal(Decimal(1000)) == "1000"
+
+
+def test_to_response_value_agrees_with_amount():
+    usdt = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+    events = ApprovalEvents(address="0x1111111254fb6c44bac0bed2854e76f90643097d", total_events=2, scanned_blocks=1, events=[
+        ApprovalEvent(token_address=usdt, spender=usdt, value="2500000"),
+        ApprovalEvent(token_address=usdt, spender=usdt, value=str(UNLIMITED)),
+    ])
+
+    limited, unlimited = to_response([events], prices={("ethereum", usdt): 2.0}, decimals={("ethereum", usdt): 6}).events
+
+    assert (limited.value, limited.amount, limited.exposure_usd) == ("2500000", "2.5", 5.0)
+    assert (unlimited.value, unlimited.amount, unlimited.is_unlimited) == ("INFINITY", None, True)
@@ -0,0 +1,73 @@
+from approvalfetcher.clients.web3_client import Web3Client
+from approvalfetcher.loadtest.generator import RequestResult, TrafficGenerator, TrafficMix
+from approvalfetcher.loadtest.report import build_report, percentile
+from approvalfetcher.loadtest.upstream import FakeRpcServer, UpstreamProfile
+from approvalfetcher.utils.chains import get_chain
+
+OWNER = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+
+
+def test_percentile_uses_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 50) == 0.0
+
+
+def test_generator_repeats_earlier_address_sets():
+    generator = TrafficGenerator(TrafficMix(address_set_sizes={3: 1.0}, repeat_rate=0.5), seed=1)
+
+    address_sets = [tuple(generator.next_addresses()) for _ in range(200)]
+
+    assert all(len(addresses) == 3 for addresses in address_sets)
+    assert 50 < len(set(address_sets)) < 150
+
+
+def test_report_counts_not_modified_as_success():
+    results = [
+        RequestResult(0.0, 0.1, 200, 1),
+        RequestResult(0.1, 0.2, 304, 1),
+        RequestResult(0.2, 0.3, 0, 1),
+    ]
+
+    report = build_report(results, duration_seconds=2.0, rpc_calls=10, coingecko_calls=4,
+                          upstream_rejections=0, worker_memory={})
+
+    assert report.succeeded == 2
+    assert report.not_modified == 1
+    assert report.statuses == {"0": 1, "200": 1, "304": 1}
+    assert report.rpc_calls_per_request == 5.0
+    assert report.sustained_rps == 1.0
+
+
+async def test_fake_rpc_serves_deterministic_approvals(monkeypatch):
+    async with FakeRpcServer(UpstreamProfile(latency_ms=0, jitter_ms=0)) as rpc:
+        monkeypatch.setenv("CHAIN_RPC_ENDPOINTS", f'{{"ethereum": "{rpc.url}/"}}')
+        chain = get_chain("ethereum")
+
+        async with Web3Client(chain) as client:
+            first = await client.get_all_approval_logs(OWNER)
+            second = await client.get_all_approval_logs(OWNER)
+            timestamps = await client.get_block_timestamps([log["blockNumber"] for log in first])
+
+        assert first and first == second
+        assert all(log["topics"][1].hex().endswith(OWNER[2:]) for log in first)
+        assert None not in timestamps
+        assert rpc.calls > 0
+
+
+async def test_token_decimals_and_balances_are_batched(monkeypatch):
+    tokens = ["0xdac17f958d2ee523a2206206994597c13d831ec7", "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"]
+    async with FakeRpcServer(UpstreamProfile(latency_ms=0, jitter_ms=0)) as rpc:
+        monkeypatch.setenv("CHAIN_RPC_ENDPOINTS", f'{{"ethereum": "{rpc.url}/"}}')
+
+        async with Web3Client(get_chain("ethereum")) as client:
+            calls_before = rpc.calls
+            decimals = await client.get_multiple_token_decimals(tokens)
+            balances = await client.get_multiple_token_balances([(token, OWNER) for token in tokens])
+
+        assert decimals == [(6, 8, 18, 18)[int(token, 16) % 4] for token in tokens]
+        assert balances == [(int(token, 16) ^ int(OWNER, 16)) % 10 ** 24 for token in tokens]
+        assert rpc.calls - calls_before == 4
@@ -0,0 +1,101 @@
+import pytest
+
+from approvalfetcher.model.approval import ApprovalEvent, ApprovalEvents
+from approvalfetcher.services.pagination import (
+    ApprovalFilters,
+    ApprovalSnapshot,
+    Cursor,
+    check_position,
+    decode_cursor,
+    encode_cursor,
+    select_page,
+)
+
+OWNER_A = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+OWNER_B = "0x68b3465833fb72a70ecdf485e0e4c7bd8665fc45"
+USDT = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+SPENDER = "0x000000000022d473030f116ddee9f6b43ac78ba3"
+
+
+def approval(token: str, value: int, block: int) -> ApprovalEvent:
+    return ApprovalEvent(token_address=token, spender=SPENDER, value=str(value), block_number=block, log_index=0)
+
+
+def snapshot() -> ApprovalSnapshot:
+    return ApprovalSnapshot(
+        last_blocks={"ethereum": 300},
+        approval_events_list=[
+            ApprovalEvents(address=OWNER_B, total_events=1, scanned_blocks=301,
+                           events=[approval(USDT, 2 ** 256 - 1, 300)]),
+            ApprovalEvents(address=OWNER_A, total_events=2, scanned_blocks=301,
+                           events=[approval(USDC, 5 * 10 ** 6, 200), approval(USDT, 10 ** 6, 100)]),
+        ],
+        prices={("ethereum", USDT): 1.0, ("ethereum", USDC): 1.0},
+        decimals={("ethereum", USDT): 6, ("ethereum", USDC): 6},
+        balances=None,
+    )
+
+
+def test_select_page_orders_by_owner_block_and_log_index():
+    page = select_page(snapshot(), ApprovalFilters(), sort_by_exposure=False, after=None, limit=None)
+
+    assert [(ae.address, [e.block_number for e in ae.events]) for ae in page.approval_events_list] == [
+        (OWNER_A, [100, 200]),
+        (OWNER_B, [300]),
+    ]
+    assert page.total == 3
+    assert page.next_position is None
+
+
+def test_select_page_walks_pages_with_positions():
+    first = select_page(snapshot(), ApprovalFilters(), sort_by_exposure=False, after=None, limit=2)
+    second = select_page(snapshot(), ApprovalFilters(), sort_by_exposure=False, after=first.next_position, limit=2)
+
+    assert [e.block_number for ae in first.approval_events_list for e in ae.events] == [100, 200]
+    assert [e.block_number for ae in second.approval_events_list for e in ae.events] == [300]
+    assert second.next_position is None
+
+
+def test_select_page_sorts_by_exposure():
+    page = select_page(snapshot(), ApprovalFilters(), sort_by_exposure=True, after=None, limit=None)
+
+    assert [e.block_number for ae in page.approval_events_list for e in ae.events] == [300, 200, 100]
+
+
+def test_select_page_applies_filters():
+    filters = ApprovalFilters(tokens={USDT}, min_value=2 * 10 ** 6)
+    page = select_page(snapshot(), filters, sort_by_exposure=False, after=None, limit=None)
+
+    assert page.total == 1
+    assert page.approval_events_list[0].address == OWNER_B
+
+    unlimited = select_page(snapshot(), ApprovalFilters(unlimited_only=True), False, None, None)
+    assert unlimited.total == 1
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(snapshot={"ethereum": 300}, position=(float("-inf"), "ethereum", OWNER_A, 100, 0), fingerprint="abc")
+
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    assert decode_cursor(encode_cursor(cursor._replace(epoch=28_000_000))).epoch == 28_000_000
+
+
+def test_check_position_matches_sort_key():
+    check_position(("ethereum", OWNER_A, 100, 0), sort_by_exposure=False)
+    check_position((float("-inf"), "ethereum", OWNER_A, 100, 0), sort_by_exposure=True)
+
+    for position, sort_by_exposure in [
+        ((1, 2), False),
+        (("ethereum", OWNER_A, "100", 0), False),
+        (("ethereum", OWNER_A, True, 0), False),
+        (("ethereum", OWNER_A, 100, 0), True),
+        (("-1", "ethereum", OWNER_A, 100, 0), True),
+    ]:
+        with pytest.raises(ValueError):
+            check_position(position, sort_by_exposure)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,113 @@
+import pytest
+
+from approvalfetcher.services.cache_backend import InMemoryCache, SqliteCache
+from approvalfetcher.services.price_refresher import PriceRefresher
+from approvalfetcher.services.price_service import PriceService
+
+USDT = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+USDC = "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48"
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+async def test_fetch_prices_serves_cached_prices_from_memory(mocker):
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0})
+    service = PriceService(client, ttl_seconds=300)
+
+    assert await service.fetch_prices([USDT.upper().replace("0X", "0x")]) == {USDT: 1.0}
+    assert await service.fetch_prices([USDT]) == {USDT: 1.0}
+    client.get_multiple_prices.assert_awaited_once_with([USDT], "ethereum")
+
+
+async def test_hot_tokens_are_served_past_ttl(mocker):
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0})
+    service = PriceService(client, ttl_seconds=0)
+
+    await service.fetch_prices([USDT])
+    service.hot_tokens(limit=10)
+    await service.fetch_prices([USDT])
+
+    client.get_multiple_prices.assert_awaited_once()
+
+
+async def test_refresh_once_batches_hot_tokens(mocker):
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0, USDC: 1.0})
+    client.get_batch_prices = mocker.AsyncMock(side_effect=lambda addresses, platform: {a: 2.0 for a in addresses})
+    service = PriceService(client, ttl_seconds=300)
+    await service.fetch_prices([USDT, USDC])
+
+    refresher = PriceRefresher([service], top_n=10, interval_seconds=300, batch_size=1, max_calls_per_minute=60_000)
+    assert await refresher.refresh_once() == 2
+    assert client.get_batch_prices.await_count == 2
+    assert await service.fetch_prices([USDT, USDC]) == {USDT: 2.0, USDC: 2.0}
+
+
+async def test_hot_tokens_past_max_staleness_are_fetched_inline(mocker):
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0})
+    service = PriceService(client, ttl_seconds=60, max_stale_seconds=300)
+    time_mock = mocker.patch("approvalfetcher.services.price_service.time.time", return_value=1000.0)
+
+    await service.fetch_prices([USDT])
+    service.hot_tokens(limit=10)
+
+    time_mock.return_value = 1200.0
+    await service.fetch_prices([USDT])
+    assert client.get_multiple_prices.await_count == 1
+
+    time_mock.return_value = 1400.0
+    await service.fetch_prices([USDT])
+    assert client.get_multiple_prices.await_count == 2
+
+
+async def test_failed_inline_lookups_are_not_cached(mocker):
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(side_effect=[{USDT: None, USDC: 1.0}, {USDT: 1.0}])
+    service = PriceService(client, ttl_seconds=300)
+
+    assert await service.fetch_prices([USDT, USDC]) == {USDT: None, USDC: 1.0}
+    assert await service.fetch_prices([USDT, USDC]) == {USDT: 1.0, USDC: 1.0}
+    client.get_multiple_prices.assert_awaited_with([USDT], "ethereum")
+
+
+async def test_refresh_budget_is_shared_between_workers(sqlite_path, mocker):
+    mocker.patch("approvalfetcher.services.price_refresher.asyncio.sleep", mocker.AsyncMock())
+    mocker.patch("approvalfetcher.services.price_refresher.time.time", return_value=6000.0)
+    async with SqliteCache(sqlite_path) as first_cache, SqliteCache(sqlite_path) as second_cache:
+        refreshers = []
+        for cache in (first_cache, second_cache):
+            client = mocker.Mock()
+            client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0, USDC: 1.0})
+            client.get_batch_prices = mocker.AsyncMock(side_effect=lambda addresses, platform: {a: 2.0 for a in addresses})
+            service = PriceService(client, ttl_seconds=300)
+            await service.fetch_prices([USDT, USDC])
+            refreshers.append(PriceRefresher([service], top_n=10, interval_seconds=300, batch_size=1,
+                                             max_calls_per_minute=3, cache=cache))
+
+        assert await refreshers[0].refresh_once() == 2
+        assert await refreshers[1].refresh_once() == 1
+
+
+async def test_expired_hot_price_is_adopted_from_another_worker(mocker):
+    cache = InMemoryCache()
+    client = mocker.Mock()
+    client.get_multiple_prices = mocker.AsyncMock(return_value={USDT: 1.0})
+    first = PriceService(client, ttl_seconds=60, cache=cache)
+    second = PriceService(client, ttl_seconds=60, cache=cache)
+    time_mock = mocker.patch("approvalfetcher.services.price_service.time.time", return_value=1000.0)
+
+    await first.fetch_prices([USDT])
+    first.hot_tokens(limit=10)
+
+    time_mock.return_value = 1100.0
+    client.get_batch_prices = mocker.AsyncMock(return_value={USDT: 2.0})
+    await second.refresh([USDT])
+
+    assert await first.fetch_prices([USDT]) == {USDT: 2.0}
+    client.get_multiple_prices.assert_awaited_once()
@@ -0,0 +1,77 @@
+from approvalfetcher.services.pagination import ApprovalSnapshot
+from approvalfetcher.services.response_cache import ResponseCache
+
+OWNER_A = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+OWNER_B = "0x68b3465833fb72A70ecDF485E0e4C7bD8665Fc45"
+
+
+def empty_snapshot() -> ApprovalSnapshot:
+    return ApprovalSnapshot(last_blocks={}, approval_events_list=[], prices={}, decimals={}, balances=None)
+
+
+def test_key_ignores_address_order_and_case():
+    cache = ResponseCache(max_entries=4, price_ttl_seconds=60)
+
+    assert (cache.key([OWNER_A, OWNER_B], False, {"ethereum": 100})
+            == cache.key([OWNER_B.lower(), OWNER_A], False, {"ethereum": 100}))
+
+
+def test_key_changes_with_blocks_and_options():
+    cache = ResponseCache(max_entries=4, price_ttl_seconds=60)
+    key = cache.key([OWNER_A], False, {"ethereum": 100})
+
+    assert key != cache.key([OWNER_A], False, {"ethereum": 101})
+    assert key != cache.key([OWNER_A], True, {"ethereum": 100})
+    assert key != cache.key([OWNER_A], False, {"ethereum": 100}, cap_to_balance=True)
+    assert key != cache.key([OWNER_A], False, {"ethereum": 100, "base": 100})
+
+
+def test_etag_depends_on_view():
+    key = ResponseCache(max_entries=4, price_ttl_seconds=60).key([OWNER_A], False, {"ethereum": 100})
+
+    assert ResponseCache.etag(key, "query", None, 10) == ResponseCache.etag(key, "query", None, 10)
+    assert ResponseCache.etag(key, "query", None, 10) != ResponseCache.etag(key, "query", "cursor", 10)
+
+
+def test_matches_if_none_match_header():
+    etag = ResponseCache.etag("key")
+
+    assert ResponseCache.matches(etag, etag)
+    assert ResponseCache.matches(etag, f'"other", W/{etag}')
+    assert ResponseCache.matches(etag, "*")
+    assert not ResponseCache.matches(etag, '"other"')
+    assert not ResponseCache.matches(etag, None)
+
+
+async def test_put_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, price_ttl_seconds=60)
+    await cache.put("a", empty_snapshot())
+    await cache.put("b", empty_snapshot())
+    await cache.get("a")
+    await cache.put("c", empty_snapshot())
+
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+
+
+def test_key_rolls_over_without_prices(mocker):
+    cache = ResponseCache(max_entries=4, price_ttl_seconds=60, max_age_seconds=600)
+    time_mock = mocker.patch("approvalfetcher.services.response_cache.time.time", return_value=1200.0)
+    key = cache.key([OWNER_A], False, {"ethereum": 100})
+
+    time_mock.return_value = 1799.0
+    assert cache.key([OWNER_A], False, {"ethereum": 100}) == key
+    time_mock.return_value = 1800.0
+    assert cache.key([OWNER_A], False, {"ethereum": 100}) != key
+
+
+def test_key_with_pinned_epoch_survives_rollover(mocker):
+    cache = ResponseCache(max_entries=4, price_ttl_seconds=60)
+    time_mock = mocker.patch("approvalfetcher.services.response_cache.time.time", return_value=600.0)
+    epoch = cache.epoch(include_price=True)
+    key = cache.key([OWNER_A], True, {"ethereum": 100})
+
+    time_mock.return_value = 700.0
+    assert cache.key([OWNER_A], True, {"ethereum": 100}, epoch=epoch) == key
+    assert cache.key([OWNER_A], True, {"ethereum": 100}) != key
@@ -0,0 +1,53 @@
+from approvalfetcher.model.approval import SpenderType
+from approvalfetcher.services.spender_service import SpenderService
+
+CONTRACT = "0x68b3465833fb72a70ecdf485e0e4c7bd8665fc45"
+EOA = "0x1111111254fb6c44bac0bed2854e76f90643097d"
+DESTROYED = "0xdac17f958d2ee523a2206206994597c13d831ec7"
+
+
+def fake_get_codes(current: dict[str, bytes], past: dict[str, bytes]):
+    async def get_codes(queries):
+        return [current[address] if block == 'latest' else past.get(address, b"") for address, block in queries]
+    return get_codes
+
+
+async def test_classify_spenders(mocker):
+    client = mocker.Mock()
+    client.get_codes = mocker.AsyncMock(side_effect=fake_get_codes(
+        current={CONTRACT: b"\x60\x80", EOA: b"", DESTROYED: b""},
+        past={DESTROYED: b"\x60\x60"},
+    ))
+    service = SpenderService(client)
+
+    classified = await service.classify({CONTRACT: 10, EOA: 20, DESTROYED: 30})
+
+    assert classified[CONTRACT].spender_type == SpenderType.CONTRACT
+    assert classified[CONTRACT].code_hash.startswith("0x")
+    assert classified[EOA].spender_type == SpenderType.EOA
+    assert classified[EOA].code_hash is None
+    assert classified[DESTROYED].spender_type == SpenderType.DESTROYED_CONTRACT
+    assert sorted(client.get_codes.await_args_list[1].args[0]) == [(EOA, 20), (DESTROYED, 30)]
+
+
+async def test_contracts_are_cached_permanently_and_eoas_expire(mocker):
+    client = mocker.Mock()
+    client.get_codes = mocker.AsyncMock(side_effect=fake_get_codes(current={CONTRACT: b"\x60", EOA: b""}, past={}))
+    service = SpenderService(client, eoa_ttl_seconds=0)
+
+    await service.classify({CONTRACT: 1, EOA: 1})
+    client.get_codes.reset_mock()
+    await service.classify({CONTRACT: 1, EOA: 1})
+
+    assert client.get_codes.await_args_list[0].args[0] == [(EOA, 'latest')]
+
+
+async def test_failed_historical_lookup_leaves_spender_unknown(mocker):
+    client = mocker.Mock()
+    client.get_codes = mocker.AsyncMock(side_effect=[[b""], [None], [b""], [b"\x60\x60"]])
+    service = SpenderService(client)
+
+    assert await service.classify({DESTROYED: 30}) == {}
+
+    classified = await service.classify({DESTROYED: 30})
+    assert classified[DESTROYED].spender_type == SpenderType.DESTROYED_CONTRACT